@@ -8,40 +8,34 @@ import sys
 import logging
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+# Use the installed package (pip install -e .); only fall back to the
+# source tree, searched last, when running from an uninstalled checkout
+try:
+    import mortgage_alert  # noqa: F401
+except ImportError:
+    sys.path.append(str(Path(__file__).parent / "src"))
 
 from mortgage_alert.core.alert_system import AlertSystem
 from mortgage_alert.core.config import config
+from mortgage_alert.cli import LOG_FILE, setup_logging as configure_logging
+
+logger = logging.getLogger(__name__)
 
 
 def setup_logging():
     """Setup logging configuration"""
-    log_level = getattr(logging, config.log_level.upper(), logging.INFO)
-    
-    # Hardcoded log file location
-    log_file = "alert.log"
-    
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    configure_logging(config.log_level)
     
     # Log the file location for reference
-    logging.getLogger(__name__).info(f"Log file created at: {log_file}")
+    logger.info("Log file created at: %s", LOG_FILE)
 
 
 def main():
     """Main function to run the mortgage alert system"""
     setup_logging()
-    logger = logging.getLogger(__name__)
     
     logger.info("Starting Enhanced Mortgage Alert System")
-    logger.info(f"Version: 2.0.0")
+    logger.info("Version: 2.0.0")
     
     try:
         # Create alert system
@@ -58,7 +52,7 @@ def main():
             return 1
             
     except Exception as e:
-        logger.error(f"Unexpected error in main: {e}")
+        logger.error("Unexpected error in main: %s", e)
         return 1
 
 
@@ -38,7 +38,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "mortgage-alert=mortgage_alert.main:main",
+            "mortgage-alert=mortgage_alert.cli:main",
         ],
     },
     include_package_data=True,
@@ -53,5 +53,8 @@ setup(
             "flake8>=3.8",
             "mypy>=0.800",
         ],
+        "fast": [
+            "orjson>=3.0",
+        ],
     },
 )
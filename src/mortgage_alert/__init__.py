@@ -16,11 +16,31 @@ __version__ = "2.0.0"
 __author__ = "Mortgage Alert Team"
 __email__ = "mortgage.alert@example.com"
 
-from .core.alert_system import AlertSystem
-from .core.config import Config
-from .scrapers.rate_scraper import EnhancedRateScraper
-from .data.data_manager import RateDataManager
-from .notifications.notification_service import NotificationService
+import importlib
+
+# Public names and the submodules that define them. They are imported on
+# first access (PEP 562) so that importing the package, e.g. to run
+# "mortgage-alert validate", doesn't pull in requests/bs4/lxml.
+_LAZY_ATTRIBUTES = {
+    "AlertSystem": ".core.alert_system",
+    "Config": ".core.config",
+    "EnhancedRateScraper": ".scrapers.rate_scraper",
+    "RateDataManager": ".data.data_manager",
+    "NotificationService": ".notifications.notification_service",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
 
 # CLI entry point
 def main():
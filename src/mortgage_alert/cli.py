@@ -4,45 +4,88 @@ Command Line Interface for the Mortgage Alert System
 
 import argparse
 import sys
+import time
 import logging
 from typing import Optional
 
-from .core.alert_system import AlertSystem
 from .core.config import config
 
+logger = logging.getLogger(__name__)
+
+# Hardcoded log file location
+LOG_FILE = "alert.log"
+
+# Accepted log level names
+LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the asctime seconds part once per second
+    
+    Records logged within the same second share the formatted timestamp;
+    only the milliseconds are filled in per record. The formatter is shared
+    by several handlers and records come from worker threads, so the cache
+    is one (second, text) tuple that is read and replaced atomically.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached = (None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_time = self._cached
+        if second != cached_second:
+            cached_time = time.strftime(self.default_time_format, self.converter(second))
+            self._cached = (second, cached_time)
+        return self.default_msec_format % (cached_time, record.msecs)
+
+
+LOG_FORMATTER = _CachedTimeFormatter('{asctime} - {name} - {levelname} - {message}', style='{')
+
 
 def setup_logging(level: str = "INFO"):
     """Setup logging configuration"""
-    log_level = getattr(logging, level.upper(), logging.INFO)
-    
-    # Hardcoded log file location
-    log_file = "alert.log"
-    
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    
+    # Write the file live so the log survives a killed or timed-out job;
+    # it is only opened when the first record is logged
+    file_handler = logging.FileHandler(LOG_FILE, delay=True)
+    file_handler.setFormatter(LOG_FORMATTER)
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(LOG_FORMATTER)
+    
+    logging.basicConfig(level=log_level, handlers=[file_handler, stream_handler], force=True)
 
 
-def run_alert_check() -> int:
+def run_alert_check(refresh: bool = False) -> int:
     """Run the alert check process"""
+    from .core.alert_system import AlertSystem
+    
     try:
-        alert_system = AlertSystem()
+        alert_system = AlertSystem(refresh=refresh)
         success = alert_system.run_alert_check()
         return 0 if success else 1
     except Exception as e:
-        logging.error(f"Error running alert check: {e}")
+        logger.error("Error running alert check: %s", e)
         return 1
 
 
-def show_status() -> int:
+def show_status(refresh: bool = False) -> int:
     """Show current system status"""
+    from .core.alert_system import AlertSystem
+    
     try:
-        alert_system = AlertSystem()
+        alert_system = AlertSystem(refresh=refresh)
         
         print("=== Mortgage Alert System Status ===")
         print(f"Target Rate: {config.target_rate}%")
@@ -65,12 +108,14 @@ def show_status() -> int:
         
         return 0
     except Exception as e:
-        logging.error(f"Error showing status: {e}")
+        logger.error("Error showing status: %s", e)
         return 1
 
 
 def show_statistics(days: int = 30) -> int:
     """Show rate statistics"""
+    from .core.alert_system import AlertSystem
+    
     try:
         alert_system = AlertSystem()
         stats = alert_system.get_rate_statistics(days)
@@ -91,7 +136,21 @@ def show_statistics(days: int = 30) -> int:
         
         return 0
     except Exception as e:
-        logging.error(f"Error showing statistics: {e}")
+        logger.error("Error showing statistics: %s", e)
+        return 1
+
+
+def rebuild_metadata() -> int:
+    """Recount stored records and rewrite the metadata file"""
+    from .data.data_manager import RateDataManager
+    
+    try:
+        metadata = RateDataManager(config.data_dir).rebuild_metadata()
+        print(f"Metadata rebuilt: {metadata.get('total_records', 0)} records, "
+              f"{metadata.get('data_size_kb', 0)} KB, trend {metadata.get('rate_trend', 'unknown')}")
+        return 0
+    except Exception as e:
+        logger.error("Error rebuilding metadata: %s", e)
         return 1
 
 
@@ -112,7 +171,7 @@ def validate_config() -> int:
             print("\n✗ Configuration has issues")
             return 1
     except Exception as e:
-        logging.error(f"Error validating configuration: {e}")
+        logger.error("Error validating configuration: %s", e)
         return 1
 
 
@@ -125,14 +184,16 @@ def main():
 Examples:
   mortgage-alert check          # Run alert check
   mortgage-alert status         # Show current status
+  mortgage-alert check --refresh # Ignore cached source rates
   mortgage-alert stats --days 7 # Show 7-day statistics
   mortgage-alert validate       # Validate configuration
+  mortgage-alert rebuild-metadata # Recount records in data/metadata.json
         """
     )
     
     parser.add_argument(
         'command',
-        choices=['check', 'status', 'stats', 'validate'],
+        choices=['check', 'status', 'stats', 'validate', 'rebuild-metadata'],
         help='Command to run'
     )
     
@@ -143,6 +204,12 @@ Examples:
         help='Number of days for statistics (default: 30)'
     )
     
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Fetch every rate source live instead of using cached rates'
+    )
+    
     parser.add_argument(
         '--log-level',
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -157,13 +224,15 @@ Examples:
     
     # Execute command
     if args.command == 'check':
-        return run_alert_check()
+        return run_alert_check(args.refresh)
     elif args.command == 'status':
-        return show_status()
+        return show_status(args.refresh)
     elif args.command == 'stats':
         return show_statistics(args.days)
     elif args.command == 'validate':
         return validate_config()
+    elif args.command == 'rebuild-metadata':
+        return rebuild_metadata()
     else:
         parser.print_help()
         return 1
@@ -1,6 +1,15 @@
 """Core modules for the mortgage alert system."""
 
-from .alert_system import AlertSystem
-from .config import Config
+from .config import Config, EmailConfig, TelegramConfig
 
-__all__ = ["AlertSystem", "Config"]
+
+def __getattr__(name):
+    # AlertSystem pulls in the scrapers and notification services; load it
+    # on first access so importing the config stays cheap
+    if name == "AlertSystem":
+        from .alert_system import AlertSystem
+        return AlertSystem
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["AlertSystem", "Config", "EmailConfig", "TelegramConfig"]
@@ -3,99 +3,157 @@ Main Alert System class that orchestrates the mortgage rate monitoring
 """
 
 import logging
+import functools
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
 
-from ..scrapers.rate_scraper import EnhancedRateScraper
-from ..data.data_manager import RateDataManager
-from ..notifications.notification_service import NotificationService
-from .config import config
+from .config import config, Config
+
+if TYPE_CHECKING:
+    from ..scrapers.rate_scraper import EnhancedRateScraper
+    from ..data.data_manager import RateDataManager
+    from ..notifications.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+# Per-source rate cache file in config.cache_dir
+RATE_CACHE_FILE = "rate_cache.json"
+
+# Notification service (module, class) and its Config settings attribute, by
+# method; the module is only imported for the configured method
+_NOTIFICATION_SERVICES = {
+    "email": (("..notifications.email_service", "EmailNotificationService"), "email_config"),
+    "telegram": (("..notifications.telegram_service", "TelegramNotificationService"), "telegram_config"),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _build_notification_service(method: str, settings: Any) -> "NotificationService":
+    """Build a notification service, reusing the instance for identical settings"""
+    (module_name, class_name), _ = _NOTIFICATION_SERVICES[method]
+    service_class = getattr(importlib.import_module(module_name, __package__), class_name)
+    return service_class(settings)
 
 
 class AlertSystem:
-    """Main alert system that coordinates rate monitoring and notifications"""
+    """Main alert system that coordinates rate monitoring and notifications
     
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        self.rate_scraper = EnhancedRateScraper()
-        self.data_manager = RateDataManager(config.data_dir)
-        self.notification_service = self._get_notification_service()
+    The scraper, data manager and notification service are created on first
+    use, so commands that only read stored data don't import the scraping
+    and notification stacks.
+    """
+    
+    def __init__(self, refresh: bool = False, settings: Optional[Config] = None):
+        # Settings for this system; the process-wide config unless given
+        self.config = settings if settings is not None else config
+        # Bypass the per-source rate cache and fetch every source live
+        self.refresh = refresh
+        # Successful rate lookup, kept for the lifetime of this run
+        self._current_rate: Optional[Tuple[float, Dict[str, Any]]] = None
+    
+    @functools.cached_property
+    def rate_scraper(self) -> "EnhancedRateScraper":
+        from ..scrapers.rate_scraper import EnhancedRateScraper
+        from ..scrapers.ttl_cache import AdaptiveTTLCache
+        rate_cache = AdaptiveTTLCache(os.path.join(self.config.cache_dir, RATE_CACHE_FILE))
+        return EnhancedRateScraper(fred_api_key=self.config.fred_api_key, rate_cache=rate_cache)
+    
+    @functools.cached_property
+    def data_manager(self) -> "RateDataManager":
+        from ..data.data_manager import RateDataManager
+        return RateDataManager(self.config.data_dir)
+    
+    @functools.cached_property
+    def notification_service(self) -> Optional["NotificationService"]:
+        return self._get_notification_service()
         
-    def _get_notification_service(self) -> Optional[NotificationService]:
+    def _get_notification_service(self) -> Optional["NotificationService"]:
         """Get the appropriate notification service based on configuration"""
+        method = self.config.notification_method
+        if method not in _NOTIFICATION_SERVICES:
+            logger.error("Unknown notification method: %s", method)
+            return None
+        
         try:
-            if config.notification_method == "email":
-                from ..notifications.email_service import EmailNotificationService
-                return EmailNotificationService(config.email_config)
-            elif config.notification_method == "telegram":
-                from ..notifications.telegram_service import TelegramNotificationService
-                return TelegramNotificationService(config.telegram_config)
-            else:
-                self.logger.error(f"Unknown notification method: {config.notification_method}")
-                return None
+            _, settings_attr = _NOTIFICATION_SERVICES[method]
+            return _build_notification_service(method, getattr(self.config, settings_attr))
         except Exception as e:
-            self.logger.error(f"Failed to initialize notification service: {e}")
+            logger.error("Failed to initialize notification service: %s", e)
             return None
     
     def get_current_rate(self) -> Tuple[Optional[float], Dict[str, Any]]:
-        """Get current rate with multi-source aggregation"""
-        self.logger.info("Fetching current refinance rate...")
+        """Get current rate with multi-source aggregation
+        
+        A successful lookup is memoized so repeated calls within the same
+        run don't hit the rate sources again.
+        """
+        if self._current_rate is not None:
+            return self._current_rate
+        
+        logger.info("Fetching current refinance rate...")
         
         try:
             # Get aggregated rate from multiple sources
-            rate, source_data = self.rate_scraper.get_aggregated_rate(config.preferred_sources)
+            rate, source_data = self.rate_scraper.get_aggregated_rate(self.config.preferred_sources, refresh=self.refresh)
             
             if rate is not None:
-                self.logger.info(f"Successfully retrieved aggregated rate: {rate}%")
-                self.logger.info(f"Rate confidence: {source_data.get('confidence', 'unknown')}")
-                self.logger.info(f"Sources used: {', '.join(source_data.get('successful_sources', []))}")
-                return rate, source_data
+                logger.info("Successfully retrieved aggregated rate: %s%%", rate)
+                logger.info("Rate confidence: %s", source_data.get('confidence', 'unknown'))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Sources used: %s", ', '.join(source_data.get('successful_sources', [])))
+                self._current_rate = (rate, source_data)
+                return self._current_rate
             else:
-                self.logger.warning("No rate retrieved from any source")
+                logger.warning("No rate retrieved from any source")
                 return None, {'error': 'No rate found'}
                 
         except Exception as e:
-            self.logger.error(f"Error getting current rate: {e}")
+            logger.error("Error getting current rate: %s", e)
             return None, {'error': str(e)}
     
     def should_send_alert(self, current_rate: float) -> bool:
         """Check if alert should be sent based on current rate"""
         # If daily report is enabled, always send
-        if config.daily_report:
+        if self.config.daily_report:
             return True
         
         # Otherwise, only send if rate is below target
-        return current_rate < config.target_rate
+        return current_rate < self.config.target_rate
     
     def send_notification(self, current_rate: float, source_data: Dict[str, Any]) -> bool:
         """Send notification with enhanced data"""
         if not self.notification_service:
-            self.logger.error("No notification service available")
+            logger.error("No notification service available")
             return False
         
         try:
+            target_rate = self.config.target_rate
+            
             # Determine notification type
-            is_alert = current_rate < config.target_rate
+            is_alert = current_rate < target_rate
             notification_type = "alert" if is_alert else "daily_report"
             
             # Send notification
             success = self.notification_service.send_alert(
                 current_rate=current_rate,
-                target_rate=config.target_rate,
-                state=config.state,
+                target_rate=target_rate,
+                state=self.config.state,
                 source_data=source_data,
                 notification_type=notification_type
             )
             
             if success:
-                self.logger.info(f"{notification_type.capitalize()} sent successfully")
+                logger.info("%s sent successfully", notification_type.capitalize())
             else:
-                self.logger.error(f"Failed to send {notification_type}")
+                logger.error("Failed to send %s", notification_type)
             
             return success
             
         except Exception as e:
-            self.logger.error(f"Error sending notification: {e}")
+            logger.error("Error sending notification: %s", e)
             return False
     
     def save_rate_data(self, current_rate: float, source_data: Dict[str, Any], 
@@ -107,79 +165,79 @@ class AlertSystem:
             success = self.data_manager.save_rate(
                 rate=current_rate,
                 source=','.join(source_data.get('successful_sources', ['unknown'])),
-                target_rate=config.target_rate,
-                state=config.state,
+                target_rate=self.config.target_rate,
+                state=self.config.state,
                 alert_sent=alert_sent,
                 daily_report_sent=daily_report_sent,
                 notes=notes
             )
             
             if success:
-                self.logger.info("Rate data saved successfully")
+                logger.info("Rate data saved successfully")
             else:
-                self.logger.error("Failed to save rate data")
+                logger.error("Failed to save rate data")
             
             return success
             
         except Exception as e:
-            self.logger.error(f"Error saving rate data: {e}")
+            logger.error("Error saving rate data: %s", e)
             return False
     
     def run_alert_check(self) -> bool:
         """Run the complete alert check process"""
-        self.logger.info("Starting mortgage rate alert check")
+        logger.info("Starting mortgage rate alert check")
         
         try:
             # Log configuration summary
-            config_summary = config.get_summary()
-            self.logger.info(f"Configuration: {config_summary}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Configuration: %s", self.config.get_summary())
             
             # Validate configuration
-            validation = config.validate()
+            validation = self.config.validate()
             if not validation.get("valid", False):
-                self.logger.error(f"Configuration validation failed: {validation}")
+                logger.error("Configuration validation failed: %s", validation)
                 return False
             
-            # Get current rate
+            # Get current rate; nothing else can run without it
             current_rate, source_data = self.get_current_rate()
-            
             if current_rate is None:
-                self.logger.error("Could not retrieve current rate")
+                logger.error("Could not retrieve current rate")
                 return False
             
-            # Determine if notification should be sent
-            should_alert = self.should_send_alert(current_rate)
+            # Decide whether to notify, and record which kind it was
+            target_rate = self.config.target_rate
             alert_sent = False
             daily_report_sent = False
-            
-            # Send notification if needed
-            if should_alert:
-                if config.daily_report:
-                    self.logger.info(f"Daily rate report: {current_rate}% - sending report")
-                    daily_report_sent = True
-                else:
-                    self.logger.info(f"Rate {current_rate}% is below target {config.target_rate}% - sending alert")
-                    alert_sent = True
-                
-                # Send notification
-                notification_success = self.send_notification(current_rate, source_data)
-                if not notification_success:
-                    self.logger.error("Failed to send notification")
+            if not self.should_send_alert(current_rate):
+                logger.info("Rate %s%% is above target %s%% - no alert needed", current_rate, target_rate)
+            elif self.config.daily_report:
+                logger.info("Daily rate report: %s%% - sending report", current_rate)
+                daily_report_sent = True
             else:
-                self.logger.info(f"Rate {current_rate}% is above target {config.target_rate}% - no alert needed")
-            
-            # Save rate data
-            self.save_rate_data(current_rate, source_data, alert_sent, daily_report_sent)
+                logger.info("Rate %s%% is below target %s%% - sending alert", current_rate, target_rate)
+                alert_sent = True
+            
+            if alert_sent or daily_report_sent:
+                # Send in the background while the rate data is saved; the
+                # record stores the decision, so it doesn't wait on the SMTP/API round trip
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    send_future = executor.submit(self.send_notification, current_rate, source_data)
+                    self.save_rate_data(current_rate, source_data, alert_sent, daily_report_sent)
+                    if not send_future.result():
+                        logger.error("Failed to send notification")
+            else:
+                self.save_rate_data(current_rate, source_data, alert_sent, daily_report_sent)
             
-            # Log data summary
-            self.logger.info("Data Summary:")
-            self.logger.info(self.data_manager.get_data_summary())
+            # Log data summary (re-reads the rate history, so skip when not logged)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Data Summary:")
+                logger.info(self.data_manager.get_data_summary())
             
-            self.logger.info("Alert check completed successfully")
+            logger.info("Alert check completed successfully")
             return True
             
         except Exception as e:
-            self.logger.error(f"Error in alert check: {e}")
+            logger.error("Error in alert check: %s", e)
             return False
     
     def get_rate_statistics(self, days: int = 30) -> Dict[str, Any]:
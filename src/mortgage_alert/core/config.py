@@ -3,86 +3,143 @@ Configuration management for the Mortgage Alert System
 """
 
 import os
+import functools
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Spellings accepted as "on" for boolean environment flags
+TRUTHY_VALUES = frozenset({"true", "1", "yes", "on"})
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load environment variables from the .env file (once per process)"""
+    load_dotenv()
+    return True
+
+
+@dataclass(frozen=True)
+class EmailConfig:
+    """SMTP settings for email notifications"""
+    __slots__ = ("smtp_server", "smtp_port", "sender_email", "sender_password", "recipient_email")
+    
+    smtp_server: str
+    smtp_port: int
+    sender_email: str
+    sender_password: str
+    recipient_email: str
+
+
+@dataclass(frozen=True)
+class TelegramConfig:
+    """Bot API settings for Telegram notifications"""
+    __slots__ = ("bot_token", "chat_id")
+    
+    bot_token: str
+    chat_id: str
 
 
 class Config:
     """Configuration class for the mortgage alert system"""
     
     def __init__(self):
+        load_env()
         self._load_config()
     
     def _load_config(self):
         """Load configuration from environment variables"""
+        # Snapshot the environment once instead of querying os.environ per key
+        self._env = os.environ.copy()
+        
         # Rate Alert Configuration
-        self.target_rate = float(self._get_env("TARGET_RATE", 6.0, float))
-        self.state = self._get_env("STATE", "Oregon")
+        self.target_rate = self._env_float("TARGET_RATE", 6.0)
+        self.state = self._env_str("STATE", "Oregon")
         
         # Notification Configuration
-        self.notification_method = self._get_env("NOTIFICATION_METHOD", "email").lower()
+        self.notification_method = (self._env_str("NOTIFICATION_METHOD") or "email").lower()
         
         # Daily Report Configuration
-        self.daily_report = self._get_env("DAILY_REPORT", "false").lower() == "true"
+        self.daily_report = self._env_bool("DAILY_REPORT", False)
         
         # Email Configuration
-        self.email_config = {
-            "smtp_server": self._get_env("SMTP_SERVER", "smtp.gmail.com"),
-            "smtp_port": int(self._get_env("SMTP_PORT", 587)),
-            "sender_email": self._get_env("SENDER_EMAIL", ""),
-            "sender_password": self._get_env("SENDER_PASSWORD", ""),
-            "recipient_email": self._get_env("RECIPIENT_EMAIL", ""),
-        }
+        self.email_config = EmailConfig(
+            smtp_server=self._env_str("SMTP_SERVER", "smtp.gmail.com"),
+            smtp_port=self._env_int("SMTP_PORT", 587),
+            sender_email=self._env_str("SENDER_EMAIL", ""),
+            sender_password=self._env_str("SENDER_PASSWORD", ""),
+            recipient_email=self._env_str("RECIPIENT_EMAIL", ""),
+        )
         
         # Telegram Configuration
-        self.telegram_config = {
-            "bot_token": self._get_env("TELEGRAM_BOT_TOKEN", ""),
-            "chat_id": self._get_env("TELEGRAM_CHAT_ID", ""),
-        }
+        self.telegram_config = TelegramConfig(
+            bot_token=self._env_str("TELEGRAM_BOT_TOKEN", ""),
+            chat_id=self._env_str("TELEGRAM_CHAT_ID", ""),
+        )
         
         # Rate Source Configuration
-        self.rate_source = self._get_env("RATE_SOURCE", "fred")
+        self.rate_source = self._env_str("RATE_SOURCE", "fred")
         
         # FRED API Configuration
-        self.fred_api_key = self._get_env("FRED_API_KEY", "")
+        self.fred_api_key = self._env_str("FRED_API_KEY", "")
         
         # Logging Configuration
-        self.log_level = self._get_env("LOG_LEVEL", "INFO")
-        self.log_file = self._get_env("LOG_FILE", "alert.log")
+        self.log_level = self._env_str("LOG_LEVEL", "INFO")
+        self.log_file = self._env_str("LOG_FILE", "alert.log")
         
         # Data Configuration
-        self.data_dir = self._get_env("DATA_DIR", "data")
+        self.data_dir = self._env_str("DATA_DIR", "data")
+        # Rate cache location; kept out of data_dir, whose contents are
+        # committed. It must persist between runs for the cache to help;
+        # the GitHub workflows restore the default path with actions/cache.
+        self.cache_dir = os.path.expanduser(self._env_str("CACHE_DIR", "~/.cache/mortgage_alert"))
         
-        # Preferred rate sources for aggregation
-        self.preferred_sources = [
+        # Preferred rate sources for aggregation (fixed, so a tuple)
+        self.preferred_sources = (
             "fred",
-            "bankrate", 
+            "bankrate",
             "mortgage_news_daily",
-            "freddiemac"
-        ]
+            "freddiemac",
+        )
+    
+    def _env_str(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a string environment variable"""
+        return self._env.get(key, default)
+    
+    def _env_int(self, key: str, default: int) -> int:
+        """Get an integer environment variable, falling back to default if unset or invalid"""
+        try:
+            return int(self._env[key])
+        except (KeyError, ValueError):
+            return default
+    
+    def _env_float(self, key: str, default: float) -> float:
+        """Get a float environment variable, falling back to default if unset or invalid"""
+        try:
+            return float(self._env[key])
+        except (KeyError, ValueError):
+            return default
+    
+    def _env_bool(self, key: str, default: bool = False) -> bool:
+        """Get a boolean environment variable; true/1/yes/on (any case) are truthy"""
+        value = self._env.get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in TRUTHY_VALUES
     
     def _get_env(self, key: str, default: Any = None, cast_type: type = str) -> Any:
-        """Get environment variable with type casting"""
-        value = os.getenv(key, default)
-        if cast_type == str:
-            return value
-        elif cast_type == bool:
-            return str(value).lower() == "true"
+        """Get environment variable with type casting
+        
+        Kept for callers outside this class; _load_config uses the typed
+        _env_* helpers directly.
+        """
+        if cast_type == bool:
+            return self._env_bool(key, default)
         elif cast_type == int:
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                return default
+            return self._env_int(key, default)
         elif cast_type == float:
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return default
-        else:
-            return value
+            return self._env_float(key, default)
+        return self._env_str(key, default)
     
     def validate(self) -> Dict[str, bool]:
         """Validate configuration and return validation results"""
@@ -91,9 +148,9 @@ class Config:
         # Validate email configuration
         if self.notification_method == "email":
             email_valid = all([
-                self.email_config.get("sender_email"),
-                self.email_config.get("sender_password"),
-                self.email_config.get("recipient_email")
+                self.email_config.sender_email,
+                self.email_config.sender_password,
+                self.email_config.recipient_email
             ])
             validation["email"] = email_valid
         else:
@@ -102,8 +159,8 @@ class Config:
         # Validate telegram configuration
         if self.notification_method == "telegram":
             telegram_valid = all([
-                self.telegram_config.get("bot_token"),
-                self.telegram_config.get("chat_id")
+                self.telegram_config.bot_token,
+                self.telegram_config.chat_id
             ])
             validation["telegram"] = telegram_valid
         else:
@@ -127,7 +184,7 @@ class Config:
             "notification_method": self.notification_method,
             "daily_report": self.daily_report,
             "log_level": self.log_level,
-            "preferred_sources": self.preferred_sources,
+            "preferred_sources": list(self.preferred_sources),
             "validation": self.validate()
         }
     
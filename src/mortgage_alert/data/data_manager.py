@@ -7,12 +7,44 @@ import csv
 import json
 import os
 import logging
-from datetime import datetime, date
-from typing import List, Dict, Optional, Any
+import mmap
+from contextlib import contextmanager
+import statistics
+from datetime import datetime, date, timedelta
+from itertools import islice
+from typing import List, Dict, Optional, Any, Tuple, Iterator
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# rates.csv size above which get_recent_rates scans the raw bytes instead
+# of building a dict per row with csv.DictReader
+MMAP_SCAN_THRESHOLD = 64 * 1024
+
+
+def _read_json(path: Path) -> Any:
+    """Load a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data: Any):
+    """Write data as 2-space indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
 
 class RateDataManager:
     """Manages rate data persistence using GitHub Artifacts"""
@@ -22,6 +54,13 @@ class RateDataManager:
         self.rates_file = self.data_dir / "rates.csv"
         self.metadata_file = self.data_dir / "metadata.json"
         
+        # (key, trend) for _calculate_trend; see _trend_key
+        self._trend_cache: Optional[Tuple[Tuple[str, int, int], str]] = None
+        
+        # Open writer and pending metadata while inside batch()
+        self._batch_writer = None
+        self._batch_pending: Dict[str, Any] = {}
+        
         # Create data directory if it doesn't exist
         self.data_dir.mkdir(exist_ok=True)
         
@@ -38,81 +77,159 @@ class RateDataManager:
                     'date', 'timestamp', 'rate', 'source', 'target_rate', 
                     'state', 'alert_sent', 'daily_report_sent', 'notes'
                 ])
-            logger.info(f"Created new rates file: {self.rates_file}")
+            logger.info("Created new rates file: %s", self.rates_file)
         
         # Initialize metadata JSON
         if not self.metadata_file.exists():
+            now = datetime.now().isoformat()
             metadata = {
-                'created': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat(),
+                'created': now,
+                'last_updated': now,
                 'total_records': 0,
                 'sources_used': [],
                 'latest_rate': None,
                 'rate_trend': 'unknown',
                 'data_size_kb': 0
             }
-            with open(self.metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            logger.info(f"Created new metadata file: {self.metadata_file}")
+            _write_json(self.metadata_file, metadata)
+            logger.info("Created new metadata file: %s", self.metadata_file)
     
     def save_rate(self, rate: float, source: str, target_rate: float, 
                   state: str, alert_sent: bool = False, 
                   daily_report_sent: bool = False, notes: str = "") -> bool:
         """Save a new rate record"""
+        return self.save_rates([{
+            'rate': rate,
+            'source': source,
+            'target_rate': target_rate,
+            'state': state,
+            'alert_sent': alert_sent,
+            'daily_report_sent': daily_report_sent,
+            'notes': notes
+        }])
+    
+    def save_rates(self, records: List[Dict[str, Any]]) -> bool:
+        """Save a batch of rate records
+        
+        Each record takes the same keys as the save_rate arguments. All rows
+        are appended in one write and the metadata is updated once per batch.
+        """
+        if not records:
+            return True
+        
         try:
+            # One timestamp for the whole batch, shared with the metadata
             current_time = datetime.now()
-            current_date = current_time.date()
+            date_str = current_time.date().isoformat()
+            timestamp = current_time.isoformat()
+            rows = []
+            for record in records:
+                rows.append([
+                    date_str,
+                    timestamp,
+                    record['rate'],
+                    record['source'],
+                    record['target_rate'],
+                    record['state'],
+                    record.get('alert_sent', False),
+                    record.get('daily_report_sent', False),
+                    record.get('notes', "")
+                ])
+            
+            sources = [record['source'] for record in records]
+            
+            if self._batch_writer is not None:
+                # Inside batch(): reuse the open file and defer the metadata
+                self._batch_writer.writerows(rows)
+                pending = self._batch_pending
+                pending['rate'] = records[-1]['rate']
+                pending['sources'].extend(sources)
+                pending['inserted'] += len(rows)
+                pending['now'] = timestamp
+                return True
             
-            # Always append new record (simple and reliable)
+            # Always append new records (simple and reliable)
             with open(self.rates_file, 'a', newline='') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    current_date.isoformat(),
-                    current_time.isoformat(),
-                    rate,
-                    source,
-                    target_rate,
-                    state,
-                    alert_sent,
-                    daily_report_sent,
-                    notes
-                ])
-            logger.info(f"Saved rate record: {rate}% from {source}")
+                writer.writerows(rows)
+            logger.info("Saved %s rate record(s), latest: %s%% from %s", len(rows), records[-1]['rate'], records[-1]['source'])
             
             # Update metadata
-            self._update_metadata(rate, source)
+            self._update_metadata(records[-1]['rate'], sources, inserted=len(rows), now=timestamp)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to save rate data: {e}")
+            logger.error("Failed to save rate data: %s", e)
             return False
     
-    def _update_metadata(self, rate: float, source: str):
-        """Update metadata file"""
+    @contextmanager
+    def batch(self) -> Iterator["RateDataManager"]:
+        """Keep rates.csv open across several save_rate/save_rates calls
+        
+        Rows are written through one file handle and the metadata is updated
+        once when the block exits. Rows saved inside the block are not
+        visible to reads until it exits. Nested calls join the outer batch.
+        """
+        if self._batch_writer is not None:
+            yield self
+            return
+        
+        self._batch_pending = pending = {'rate': None, 'sources': [], 'inserted': 0, 'now': None}
         try:
-            with open(self.metadata_file, 'r') as f:
-                metadata = json.load(f)
+            with open(self.rates_file, 'a', newline='') as f:
+                self._batch_writer = csv.writer(f)
+                yield self
+        finally:
+            self._batch_writer = None
+            self._batch_pending = {}
+            # Rows written before an error are on disk, so always account for them
+            if pending['inserted']:
+                logger.info("Saved %s rate record(s) in batch, latest: %s%%", pending['inserted'], pending['rate'])
+                self._update_metadata(pending['rate'], pending['sources'],
+                                      inserted=pending['inserted'], now=pending['now'])
+    
+    def _update_metadata(self, rate: float, sources: List[str], inserted: int = 1, now: Optional[str] = None):
+        """Update metadata file after `inserted` records were saved at `now` (ISO timestamp)"""
+        try:
+            metadata = _read_json(self.metadata_file)
             
             # Update metadata
-            metadata['last_updated'] = datetime.now().isoformat()
+            metadata['last_updated'] = now or datetime.now().isoformat()
             metadata['latest_rate'] = rate
-            metadata['total_records'] = self._count_records()
+            # Keep a running count instead of re-reading the whole CSV
+            metadata['total_records'] = metadata.get('total_records', 0) + inserted
             metadata['data_size_kb'] = self._get_file_size_kb()
             
-            if source not in metadata['sources_used']:
-                metadata['sources_used'].append(source)
+            for source in sources:
+                if source not in metadata['sources_used']:
+                    metadata['sources_used'].append(source)
             
             # Calculate trend
             metadata['rate_trend'] = self._calculate_trend()
             
-            with open(self.metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            _write_json(self.metadata_file, metadata)
                 
         except Exception as e:
-            logger.error(f"Failed to update metadata: {e}")
+            logger.error("Failed to update metadata: %s", e)
+    
+    def rebuild_metadata(self) -> Dict[str, Any]:
+        """Recount records from the CSV and rewrite the derived metadata
+        
+        save_rates keeps total_records as a running count; use this to
+        reconcile it if rates.csv was edited or restored by hand.
+        """
+        metadata = self.get_metadata()
+        metadata['last_updated'] = datetime.now().isoformat()
+        metadata['total_records'] = self._count_records()
+        metadata['data_size_kb'] = self._get_file_size_kb()
+        metadata['rate_trend'] = self._calculate_trend()
+        
+        _write_json(self.metadata_file, metadata)
+        logger.info("Rebuilt metadata: %s records", metadata['total_records'])
+        return metadata
     
     def _count_records(self) -> int:
-        """Count total number of rate records"""
+        """Count total number of rate records by reading the CSV"""
         try:
             with open(self.rates_file, 'r', newline='') as f:
                 reader = csv.reader(f)
@@ -128,56 +245,112 @@ class RateDataManager:
         except Exception:
             return 0
     
+    def _trend_key(self) -> Optional[Tuple[str, int, int]]:
+        """Cache key for the trend: today's date and the rates file's mtime and size
+        
+        The date moves the 7-day window, and the file stat picks up writes
+        from any RateDataManager instance or process. Rows buffered inside
+        batch() are not on disk yet, so they only change the key once flushed.
+        """
+        try:
+            stat = os.stat(self.rates_file)
+        except OSError:
+            return None
+        return (date.today().isoformat(), stat.st_mtime_ns, stat.st_size)
+    
     def _calculate_trend(self) -> str:
-        """Calculate rate trend over last 7 days"""
+        """Calculate rate trend over last 7 days (cached while the file and date are unchanged)"""
+        key = self._trend_key()
+        if key is not None and self._trend_cache and self._trend_cache[0] == key:
+            return self._trend_cache[1]
+        
+        trend = self._compute_trend()
+        self._trend_cache = (key, trend) if key is not None else None
+        return trend
+    
+    def _compute_trend(self) -> str:
+        """Compute the 7-day trend from the rates file"""
         try:
             recent_rates = self.get_recent_rates(days=7)
             if len(recent_rates) < 2:
                 return 'insufficient_data'
             
-            # Simple trend calculation
-            first_half = recent_rates[:len(recent_rates)//2]
-            second_half = recent_rates[len(recent_rates)//2:]
-            
-            if not first_half or not second_half:
-                return 'insufficient_data'
+            # Simple trend calculation: compare the newer half of the window
+            # with the older half (rates are most recent first). The older
+            # half's sum is derived from the total, so no sublists are built.
+            n = len(recent_rates)
+            half = n // 2
+            newer_sum = sum(islice(recent_rates, half))
+            avg_newer = newer_sum / half
+            avg_older = (sum(recent_rates) - newer_sum) / (n - half)
             
-            avg_first = sum(first_half) / len(first_half)
-            avg_second = sum(second_half) / len(second_half)
-            
-            if avg_second > avg_first + 0.1:
+            if avg_newer > avg_older + 0.1:
                 return 'rising'
-            elif avg_second < avg_first - 0.1:
+            elif avg_newer < avg_older - 0.1:
                 return 'falling'
             else:
                 return 'stable'
                 
         except Exception as e:
-            logger.error(f"Error calculating trend: {e}")
+            logger.error("Error calculating trend: %s", e)
             return 'unknown'
     
     def get_recent_rates(self, days: int = 30) -> List[float]:
-        """Get recent rates for trend analysis"""
+        """Get rates recorded in the last `days` days, most recent first"""
         try:
             rates = []
-            cutoff_date = datetime.now().date().replace(day=max(1, datetime.now().day - days))
+            # ISO dates compare correctly as strings, so rows are filtered
+            # without parsing each date
+            cutoff_date = (date.today() - timedelta(days=days)).isoformat()
             
-            with open(self.rates_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        record_date = datetime.fromisoformat(row['date']).date()
-                        if record_date >= cutoff_date:
-                            rates.append(float(row['rate']))
-                    except (ValueError, KeyError):
-                        continue
+            if self.rates_file.stat().st_size > MMAP_SCAN_THRESHOLD:
+                rates = self._scan_recent_rates(cutoff_date)
+            else:
+                with open(self.rates_file, 'r', newline='') as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        try:
+                            if row['date'] >= cutoff_date:
+                                rates.append(float(row['rate']))
+                        except (ValueError, KeyError, TypeError):
+                            continue
             
-            return sorted(rates, reverse=True)  # Most recent first
+            rates.reverse()  # Rows are appended in time order
+            return rates
             
         except Exception as e:
-            logger.error(f"Error getting recent rates: {e}")
+            logger.error("Error getting recent rates: %s", e)
             return []
     
+    def _scan_recent_rates(self, cutoff_date: str) -> List[float]:
+        """Collect rates on or after cutoff_date, oldest first, from the raw CSV bytes
+        
+        Relies on the fixed column order written by save_rates: date,
+        timestamp and rate come first and never contain quotes or commas,
+        so only those fields are sliced out of each line.
+        """
+        cutoff = cutoff_date.encode('ascii')
+        rates = []
+        with open(self.rates_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            start = mm.find(b'\n') + 1  # Skip header
+            while 0 < start < size:
+                end = mm.find(b'\n', start)
+                if end == -1:
+                    end = size
+                date_end = mm.find(b',', start, end)
+                if date_end != -1 and mm[start:date_end] >= cutoff:
+                    rate_start = mm.find(b',', date_end + 1, end) + 1
+                    rate_end = mm.find(b',', rate_start, end)
+                    if rate_start and rate_end != -1:
+                        try:
+                            rates.append(float(mm[rate_start:rate_end]))
+                        except ValueError:
+                            pass
+                start = end + 1
+        return rates
+    
     def get_rate_statistics(self, days: int = 30) -> Dict[str, Any]:
         """Get rate statistics for the specified period"""
         try:
@@ -185,38 +358,39 @@ class RateDataManager:
             if not rates:
                 return {'error': 'No data available'}
             
+            mean = statistics.fmean(rates)
             return {
                 'period_days': days,
                 'record_count': len(rates),
                 'latest_rate': rates[0] if rates else None,
-                'average_rate': round(sum(rates) / len(rates), 3),
+                'average_rate': round(mean, 3),
                 'min_rate': min(rates),
                 'max_rate': max(rates),
                 'trend': self._calculate_trend(),
-                'volatility': round(self._calculate_volatility(rates), 3),
+                'volatility': round(self._calculate_volatility(rates, mean), 3),
                 'data_size_kb': self._get_file_size_kb()
             }
             
         except Exception as e:
-            logger.error(f"Error calculating statistics: {e}")
+            logger.error("Error calculating statistics: %s", e)
             return {'error': str(e)}
     
-    def _calculate_volatility(self, rates: List[float]) -> float:
-        """Calculate rate volatility (standard deviation)"""
+    def _calculate_volatility(self, rates: List[float], mean: Optional[float] = None) -> float:
+        """Calculate rate volatility (population standard deviation)
+        
+        Pass the already computed mean to avoid a second pass over the rates.
+        """
         if len(rates) < 2:
             return 0.0
         
-        mean = sum(rates) / len(rates)
-        variance = sum((rate - mean) ** 2 for rate in rates) / len(rates)
-        return variance ** 0.5
+        return statistics.pstdev(rates, mean)
     
     def get_metadata(self) -> Dict[str, Any]:
         """Get current metadata"""
         try:
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
+            return _read_json(self.metadata_file)
         except Exception as e:
-            logger.error(f"Error reading metadata: {e}")
+            logger.error("Error reading metadata: %s", e)
             return {}
     
     def get_data_summary(self) -> str:
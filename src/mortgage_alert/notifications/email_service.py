@@ -2,107 +2,46 @@
 Email notification service
 """
 
-import smtplib
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, TYPE_CHECKING
+from string import Template
 
 from .notification_service import NotificationService
 
+logger = logging.getLogger(__name__)
 
-class EmailNotificationService(NotificationService):
-    """Email notification service using SMTP"""
-    
-    def __init__(self, config: Dict[str, Any]):
-        self.smtp_server = config.get("smtp_server", "smtp.gmail.com")
-        self.smtp_port = config.get("smtp_port", 587)
-        self.sender_email = config.get("sender_email", "")
-        self.sender_password = config.get("sender_password", "")
-        self.recipient_emails = config.get("recipient_email", "").split(',')
-        
-        # Clean up email addresses (remove whitespace)
-        self.recipient_emails = [email.strip() for email in self.recipient_emails if email.strip()]
-        
-        self.logger = logging.getLogger(__name__)
-        
-        if not all([self.sender_email, self.sender_password]) or not self.recipient_emails:
-            raise ValueError("Email configuration incomplete. Please check sender_email, sender_password, and recipient_email.")
-    
-    def send_alert(self, current_rate: float, target_rate: float, state: str, 
-                   source_data: Dict[str, Any] = None, notification_type: str = "alert") -> bool:
-        """Send email alert to all recipients"""
-        try:
-            # Create message content
-            content = self._create_message_content(current_rate, target_rate, state, source_data, notification_type)
-            
-            # Create message
-            subject = content['title']
-            body = self._create_email_body(content)
-            
-            # Create MIME message
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
-            msg['To'] = ', '.join(self.recipient_emails)
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
-            
-            self.logger.info(f"Email {notification_type} sent successfully to {len(self.recipient_emails)} recipients")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to send email {notification_type}: {e}")
-            return False
-    
-    def _create_email_body(self, content: Dict[str, Any]) -> str:
-        """Create HTML email body"""
-        is_alert = content['is_alert']
-        color = '#28a745' if is_alert else '#007bff'
-        bg_color = '#e8f5e8' if is_alert else '#e3f2fd'
-        text_color = '#155724' if is_alert else '#0d47a1'
-        
-        html_body = f"""
+if TYPE_CHECKING:
+    import smtplib
+
+# HTML email layout shared by alerts and daily reports
+_EMAIL_LAYOUT = Template("""
         <html>
         <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 10px; border-left: 5px solid {color};">
-                <h2 style="color: {color}; margin-top: 0;">{content['title']}</h2>
-                <p style="color: #666; margin-bottom: 20px;">{content['subtitle']}</p>
+            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 10px; border-left: 5px solid $color;">
+                <h2 style="color: $color; margin-top: 0;">$title</h2>
+                <p style="color: #666; margin-bottom: 20px;">$subtitle</p>
                 
                 <div style="background-color: white; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                    <h3 style="margin-top: 0; color: #333;">Current Rate: <span style="color: {color}; font-weight: bold;">{content['current_rate']}</span></h3>
-                    <p style="margin: 5px 0; color: #666;">Target Rate: {content['target_rate']}</p>
-                    <p style="margin: 5px 0; color: #666;">State: {content['state']}</p>
-                    <p style="margin: 5px 0; color: #666;">Date: {content['date']}</p>
-                    {f'<p style="margin: 5px 0; color: #666;">Potential Savings: <strong>{content["savings"]}</strong></p>' if content['savings'] else ''}
-                    {f'<p style="margin: 5px 0; color: #666; font-size: 12px;">{content["source_info"]}</p>' if content['source_info'] else ''}
+                    <h3 style="margin-top: 0; color: #333;">Current Rate: <span style="color: $color; font-weight: bold;">$current_rate</span></h3>
+                    <p style="margin: 5px 0; color: #666;">Target Rate: $target_rate</p>
+                    <p style="margin: 5px 0; color: #666;">State: $state</p>
+                    <p style="margin: 5px 0; color: #666;">Date: $date</p>
+                    $savings_html
+                    $source_html
                 </div>
                 
-                {self._get_action_section(content)}
+                $action_section
                 
                 <p style="color: #666; font-size: 12px; margin-top: 20px;">
-                    Report generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
+                    Report generated on $generated_at
                 </p>
             </div>
         </body>
         </html>
-        """
-        
-        return html_body
-    
-    def _get_action_section(self, content: Dict[str, Any]) -> str:
-        """Get action section based on notification type"""
-        is_alert = content['is_alert']
-        
-        if is_alert:
-            return f"""
+        """)
+
+# Static action sections for alert and daily report emails
+_ALERT_ACTION_HTML = """
             <div style="background-color: #e8f5e8; padding: 15px; border-radius: 8px; margin: 15px 0;">
                 <h4 style="margin-top: 0; color: #155724;">What This Means:</h4>
                 <ul style="color: #155724;">
@@ -122,8 +61,8 @@ class EmailNotificationService(NotificationService):
                 </ol>
             </div>
             """
-        else:
-            return f"""
+
+_REPORT_ACTION_HTML = """
             <div style="background-color: #e3f2fd; padding: 15px; border-radius: 8px; margin: 15px 0;">
                 <h4 style="margin-top: 0; color: #0d47a1;">Rate Analysis:</h4>
                 <ul style="color: #0d47a1;">
@@ -133,3 +72,140 @@ class EmailNotificationService(NotificationService):
                 </ul>
             </div>
             """
+
+# Per-notification-type templates with colour and action section baked in
+_EMAIL_ALERT_TEMPLATE = Template(_EMAIL_LAYOUT.safe_substitute(
+    color='#28a745', action_section=_ALERT_ACTION_HTML))
+_EMAIL_REPORT_TEMPLATE = Template(_EMAIL_LAYOUT.safe_substitute(
+    color='#007bff', action_section=_REPORT_ACTION_HTML))
+
+
+
+class EmailNotificationService(NotificationService):
+    """Email notification service using SMTP"""
+    
+    def __init__(self, config: Any):
+        # Cached SMTP connection, opened lazily and reused across sends
+        self._smtp = None
+        
+        self.smtp_server = self._setting(config, "smtp_server", "smtp.gmail.com")
+        self.smtp_port = self._setting(config, "smtp_port", 587)
+        self.sender_email = self._setting(config, "sender_email", "")
+        self.sender_password = self._setting(config, "sender_password", "")
+        
+        # Split comma-separated recipients, dropping whitespace and empty entries
+        self.recipient_emails = [email for email in map(str.strip, self._setting(config, "recipient_email", "").split(',')) if email]
+        
+        if not all([self.sender_email, self.sender_password]) or not self.recipient_emails:
+            raise ValueError("Email configuration incomplete. Please check sender_email, sender_password, and recipient_email.")
+    
+    def send_alert(self, current_rate: float, target_rate: float, state: str, 
+                   source_data: Dict[str, Any] = None, notification_type: str = "alert") -> bool:
+        """Send email alert to each recipient in its own envelope
+        
+        Returns False unless every recipient was accepted by the server;
+        refused recipients are logged.
+        """
+        import smtplib
+        from email.message import EmailMessage
+        
+        try:
+            # Create message content
+            content = self._create_message_content(current_rate, target_rate, state, source_data, notification_type)
+            
+            # Create message and serialize it once; the To header names no
+            # one, so recipients never see each other's addresses
+            msg = EmailMessage()
+            msg['From'] = self.sender_email
+            msg['To'] = 'undisclosed-recipients:;'
+            msg['Subject'] = content['title']
+            msg.set_content(self._create_email_body(content), subtype='html')
+            payload = msg.as_bytes()
+            
+            # One envelope per recipient over the same connection, so a
+            # refusal or rejected message for one doesn't block the rest
+            smtp = self._get_smtp()
+            failed = {}
+            for recipient in self.recipient_emails:
+                try:
+                    smtp.sendmail(self.sender_email, [recipient], payload)
+                except smtplib.SMTPRecipientsRefused as e:
+                    failed.update(e.recipients)
+                except smtplib.SMTPResponseException as e:
+                    # The server answered, so the connection is still usable
+                    failed[recipient] = (e.smtp_code, e.smtp_error)
+            
+            if failed:
+                logger.error("Email %s refused for %s of %s recipients: %s", notification_type,
+                             len(failed), len(self.recipient_emails), ', '.join(failed))
+                return False
+            
+            logger.info("Email %s sent successfully to %s recipients", notification_type, len(self.recipient_emails))
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to send email %s: %s", notification_type, e)
+            self.close()
+            return False
+    
+    def _get_smtp(self) -> "smtplib.SMTP":
+        """Get an authenticated SMTP connection, reusing the cached one if alive"""
+        import smtplib
+        
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        
+        self._smtp = server
+        return server
+    
+    def close(self):
+        """Close the cached SMTP connection"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            # Server already gone; just drop the socket
+            self._smtp.close()
+        finally:
+            self._smtp = None
+    
+    def __del__(self):
+        self.close()
+    
+    def _create_email_body(self, content: Dict[str, Any]) -> str:
+        """Create HTML email body"""
+        template = _EMAIL_ALERT_TEMPLATE if content['is_alert'] else _EMAIL_REPORT_TEMPLATE
+        
+        savings_html = ''
+        if content['savings']:
+            savings_html = f'<p style="margin: 5px 0; color: #666;">Potential Savings: <strong>{content["savings"]}</strong></p>'
+        
+        source_html = ''
+        if content['source_info']:
+            source_html = f'<p style="margin: 5px 0; color: #666; font-size: 12px;">{content["source_info"]}</p>'
+        
+        return template.substitute(
+            title=content['title'],
+            subtitle=content['subtitle'],
+            current_rate=content['current_rate'],
+            target_rate=content['target_rate'],
+            state=content['state'],
+            date=content['date'],
+            savings_html=savings_html,
+            source_html=source_html,
+            generated_at=content['generated_at']
+        )
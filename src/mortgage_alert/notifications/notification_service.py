@@ -2,10 +2,18 @@
 Base notification service class
 """
 
+import functools
 from abc import ABC, abstractmethod
+from datetime import datetime, date
 from typing import Dict, Any
 
 
+@functools.lru_cache(maxsize=1)
+def _format_day(day: date) -> str:
+    """Format a date for message headers; repeated sends on one day reuse it"""
+    return day.strftime('%B %d, %Y')
+
+
 class NotificationService(ABC):
     """Base class for notification services"""
     
@@ -15,12 +23,29 @@ class NotificationService(ABC):
         """Send rate alert notification"""
         pass
     
+    @staticmethod
+    def _setting(config: Any, key: str, default: Any = None) -> Any:
+        """Read a setting from a config dataclass or a plain dict"""
+        if isinstance(config, dict):
+            return config.get(key, default)
+        return getattr(config, key, default)
+    
+    def close(self):
+        """Release any connections held by the service"""
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def _create_message_content(self, current_rate: float, target_rate: float, state: str,
                                source_data: Dict[str, Any] = None, notification_type: str = "alert") -> Dict[str, str]:
         """Create message content for notifications"""
         is_alert = notification_type == "alert"
         savings = target_rate - current_rate
-        current_date = self._get_current_date()
+        now = datetime.now()
         
         # Determine title and subtitle
         if is_alert:
@@ -44,13 +69,9 @@ class NotificationService(ABC):
             'current_rate': f"{current_rate}%",
             'target_rate': f"{target_rate}%",
             'state': state,
-            'date': current_date,
+            'date': _format_day(now.date()),
+            'generated_at': now.strftime('%B %d, %Y at %I:%M %p'),
             'savings': f"{savings:.2f}%" if is_alert else "",
             'is_alert': is_alert,
             'source_info': source_info
         }
-    
-    def _get_current_date(self) -> str:
-        """Get current date formatted for display"""
-        from datetime import datetime
-        return datetime.now().strftime('%B %d, %Y')
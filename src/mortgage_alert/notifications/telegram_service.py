@@ -2,24 +2,95 @@
 Telegram notification service
 """
 
-import requests
 import logging
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, TYPE_CHECKING
+from string import Template
 
 from .notification_service import NotificationService
 
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    import requests
+
+# Telegram message layout shared by alerts and daily reports
+_TELEGRAM_LAYOUT = Template("""
+$emoji <b>$title</b>
+
+$subtitle
+
+📊 <b>Rate Information:</b>
+• Current Rate: <b>$current_rate</b>
+• Target Rate: $target_rate
+• Date: $date
+$savings_line
+$source_line
+
+$action_section
+
+⏰ Report generated on $generated_at
+        """)
+
+# Static action sections for alert and daily report messages
+_ALERT_ACTION_TEXT = """
+💡 <b>What This Means:</b>
+• This could be a good time to consider refinancing
+• Contact your mortgage lender to discuss options
+• Compare rates from multiple lenders
+
+📋 <b>Next Steps:</b>
+1. Contact multiple lenders for quotes
+2. Compare closing costs and fees
+3. Calculate your break-even point
+4. Consider your long-term financial goals
+"""
+
+_REPORT_ACTION_TEXT = """
+📈 <b>Rate Analysis:</b>
+• Current market conditions and trends
+• Historical rate comparison
+• Refinancing considerations
+"""
+
+# Per-notification-type templates with emoji and action section baked in
+_TELEGRAM_ALERT_TEMPLATE = Template(_TELEGRAM_LAYOUT.safe_substitute(
+    emoji="🚨", action_section=_ALERT_ACTION_TEXT))
+_TELEGRAM_REPORT_TEMPLATE = Template(_TELEGRAM_LAYOUT.safe_substitute(
+    emoji="📊", action_section=_REPORT_ACTION_TEXT))
+
+
+
+def _create_session() -> "requests.Session":
+    """Create a keep-alive session for the Telegram Bot API"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    # sendMessage is not idempotent: after a read error or a 5xx the message
+    # may already have been delivered, so only retry failures that mean it
+    # wasn't - connection errors and 429 (honouring Retry-After)
+    retries = Retry(total=3, connect=3, read=0, other=0, backoff_factor=0.3,
+                    status_forcelist=[429],
+                    allowed_methods=frozenset(['POST']),
+                    respect_retry_after_header=True)
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries))
+    return session
+
 
 class TelegramNotificationService(NotificationService):
     """Telegram notification service using bot API"""
     
-    def __init__(self, config: Dict[str, Any]):
-        self.bot_token = config.get("bot_token")
-        self.chat_id = config.get("chat_id")
-        self.logger = logging.getLogger(__name__)
-        
+    # Shared by all instances so repeated sends reuse the TLS connection;
+    # created on first send so importing the module doesn't load requests
+    _session = None
+    
+    def __init__(self, config: Any):
+        self.bot_token = self._setting(config, "bot_token")
+        self.chat_id = self._setting(config, "chat_id")
         if not all([self.bot_token, self.chat_id]):
             raise ValueError("Telegram configuration incomplete. Please check bot_token and chat_id.")
+        self._url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
     
     def send_alert(self, current_rate: float, target_rate: float, state: str, 
                    source_data: Dict[str, Any] = None, notification_type: str = "alert") -> bool:
@@ -29,68 +100,42 @@ class TelegramNotificationService(NotificationService):
             content = self._create_message_content(current_rate, target_rate, state, source_data, notification_type)
             message = self._create_telegram_message(content)
             
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             data = {
                 "chat_id": self.chat_id,
                 "text": message,
                 "parse_mode": "HTML"
             }
             
-            response = requests.post(url, data=data, timeout=30)
+            response = self._get_session().post(self._url, data=data, timeout=30)
             response.raise_for_status()
             
-            self.logger.info(f"Telegram {notification_type} sent successfully to chat {self.chat_id}")
+            logger.info("Telegram %s sent successfully to chat %s", notification_type, self.chat_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send Telegram {notification_type}: {e}")
+            logger.error("Failed to send Telegram %s: %s", notification_type, e)
             return False
     
+    @classmethod
+    def _get_session(cls) -> "requests.Session":
+        """Get the shared Telegram API session, creating it on first use"""
+        if cls._session is None:
+            cls._session = _create_session()
+        return cls._session
+    
     def _create_telegram_message(self, content: Dict[str, Any]) -> str:
         """Create Telegram message"""
-        is_alert = content['is_alert']
-        emoji = "🚨" if is_alert else "📊"
+        template = _TELEGRAM_ALERT_TEMPLATE if content['is_alert'] else _TELEGRAM_REPORT_TEMPLATE
         
-        message = f"""
-{emoji} <b>{content['title']}</b>
-
-{content['subtitle']}
-
-📊 <b>Rate Information:</b>
-• Current Rate: <b>{content['current_rate']}</b>
-• Target Rate: {content['target_rate']}
-• Date: {content['date']}
-{f'• Potential Savings: <b>{content["savings"]}</b>' if content['savings'] else ''}
-{f'• {content["source_info"]}' if content['source_info'] else ''}
-
-{self._get_telegram_action_section(content)}
-
-⏰ Report generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-        """
+        message = template.substitute(
+            title=content['title'],
+            subtitle=content['subtitle'],
+            current_rate=content['current_rate'],
+            target_rate=content['target_rate'],
+            date=content['date'],
+            savings_line=f'• Potential Savings: <b>{content["savings"]}</b>' if content['savings'] else '',
+            source_line=f'• {content["source_info"]}' if content['source_info'] else '',
+            generated_at=content['generated_at']
+        )
         
         return message.strip()
-    
-    def _get_telegram_action_section(self, content: Dict[str, Any]) -> str:
-        """Get action section for Telegram message"""
-        is_alert = content['is_alert']
-        
-        if is_alert:
-            return """
-💡 <b>What This Means:</b>
-• This could be a good time to consider refinancing
-• Contact your mortgage lender to discuss options
-• Compare rates from multiple lenders
-
-📋 <b>Next Steps:</b>
-1. Contact multiple lenders for quotes
-2. Compare closing costs and fees
-3. Calculate your break-even point
-4. Consider your long-term financial goals
-"""
-        else:
-            return """
-📈 <b>Rate Analysis:</b>
-• Current market conditions and trends
-• Historical rate comparison
-• Refinancing considerations
-"""
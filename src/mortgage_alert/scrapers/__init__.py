@@ -1,5 +1,6 @@
 """Rate scraping modules."""
 
 from .rate_scraper import EnhancedRateScraper, get_enhanced_rate_scraper, get_mock_rate
+from .ttl_cache import AdaptiveTTLCache
 
-__all__ = ["EnhancedRateScraper", "get_enhanced_rate_scraper", "get_mock_rate"]
+__all__ = ["EnhancedRateScraper", "get_enhanced_rate_scraper", "get_mock_rate", "AdaptiveTTLCache"]
@@ -4,39 +4,329 @@ Fetches current refinance mortgage rates from multiple sources with improved rel
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import soupsieve
 import logging
 import statistics
-from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Optional, Dict, Any, List, Tuple, Sequence, Callable
 import time
-import random
 import os
 import re
+import threading
+import random
+import functools
+from urllib.parse import urlparse
+from datetime import date, timedelta
+
+from .ttl_cache import AdaptiveTTLCache
 
 logger = logging.getLogger(__name__)
 
+# All rate spellings in one alternation so a text is scanned once: a number
+# followed by %/percent/APR/interest/fixed/refinance (group 1), or a number
+# after "rate" (group 2), e.g. "5.25%", "5.25 APR", "rate: 5.25"
+_RATE_RE = re.compile(
+    r'(\d+\.\d+)(?:%|\s*(?:percent|APR|interest|fixed|refinance))|rate[:\s]*(\d+\.\d+)',
+    re.IGNORECASE
+)
+
+# Reasonable mortgage rate range (percent), see _validate_rate
+_MIN_RATE = 2.0
+_MAX_RATE = 15.0
+
+# A percentage in the valid _MIN_RATE-_MAX_RATE range, used as a whole-page
+# fallback. The range is encoded in the pattern so out-of-range numbers
+# never match; keep it in step with the constants above.
+_VALID_RATE_RE = re.compile(r'(?<![\d.])((?:[2-9]|1[0-4])\.\d+|15\.0+)\s*%')
+
+# Fast path on the raw page bytes: a percentage that is the leading text of
+# an element with a class token built around the word "rate", e.g.
+# <div class="rate-value">5.25% or class="big current_rate". "rate" must be
+# the whole token or a -/_ separated part of it, so "moderate" or
+# "corporate" never match.
+_FAST_RATE_RE = re.compile(
+    rb'class="(?:[^"]*\s)?(?:[\w-]*[-_])?rate(?:[-_][\w-]*)?(?:\s[^"]*)?"[^>]*>\s*(\d+\.\d+)\s*%',
+    re.IGNORECASE
+)
+
+# FRED 30-year fixed mortgage series and its endpoints; only the series id
+# and API key vary per request
+FRED_SERIES_ID = "MORTGAGE30US"
+_FRED_API_URL = ("https://api.stlouisfed.org/fred/series/observations"
+                 "?series_id={series_id}&api_key={api_key}&file_type=json&limit=1&sort_order=desc")
+_FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}&cosd={start}"
+
+# Days of history requested from the FRED CSV endpoint; the series is
+# weekly, so this is a handful of rows that still spans holiday gaps
+FRED_CSV_WINDOW_DAYS = 35
+
+# Default minimum spacing between requests to the same host (seconds);
+# requests to different hosts are not delayed
+MIN_REQUEST_INTERVAL = 0.5
+
+# host -> monotonic time of the latest scheduled request, see _throttle.
+# Shared by all scrapers since they share one session.
+_last_request_at: Dict[str, float] = {}
+_throttle_lock = threading.Lock()
+
+
+def _throttle(url: str, min_interval: float = MIN_REQUEST_INTERVAL):
+    """Sleep just long enough to keep same-host requests min_interval apart"""
+    if min_interval <= 0:
+        return
+    host = urlparse(url).netloc
+    with _throttle_lock:
+        now = time.monotonic()
+        scheduled = max(now, _last_request_at.get(host, float('-inf')) + min_interval)
+        _last_request_at[host] = scheduled
+    if scheduled > now:
+        time.sleep(scheduled - now)
+
+
+# Overall deadline for one aggregation round (seconds). Sources still
+# running after it are reported as timed out. Their requests are bounded by
+# it: each attempt's timeout is cut to the time left (see _make_request) and
+# no retry is made that could not finish in time (see _DeadlineRetry), so
+# the abandoned threads end by the deadline instead of holding up
+# interpreter exit. HTTP timeouts apply per connect and per read, so a
+# server trickling bytes can still hold a thread a little past it.
+SOURCE_TIMEOUT = 45
+
+# Per-attempt HTTP timeout outside an aggregation round (seconds)
+REQUEST_TIMEOUT = 30
+
+# Deadline (monotonic time) of the aggregation round the current worker
+# thread is fetching for, set by EnhancedRateScraper._run_source, and the
+# per-attempt timeout of its current request, set by _make_request
+_source_deadline = threading.local()
+
+# Longest time each source's rate is trusted from the per-source cache
+# (seconds), by how often the source publishes: FRED and Freddie Mac
+# weekly, the rate sites intraday
+SOURCE_MAX_TTL = {
+    'fred': 24 * 60 * 60,
+    'freddiemac': 24 * 60 * 60,
+    'bankrate': 60 * 60,
+    'mortgage_news_daily': 30 * 60,
+    'zillow': 60 * 60,
+    'nerdwallet': 60 * 60,
+}
+
+# Stop waiting for slower sources once this many valid rates agree
+# closely enough for high confidence
+EARLY_EXIT_MIN_SOURCES = 3
+
+# Combined CSS selector for each HTML source, compiled once and matched in one DOM pass
+_BANKRATE_SELECTOR = soupsieve.compile(', '.join((
+    '.rate-value',
+    '.current-rate',
+    '.mortgage-rate',
+    '.refinance-rate',
+    '.rate',
+    '.apr',
+    '.interest-rate',
+    '[data-testid*="rate"]',
+    '[class*="rate"]',
+    '[class*="apr"]',
+    '.rate-display',
+    '.rate-number',
+    '.primary-rate',
+    '.main-rate',
+)))
+
+_MND_SELECTOR = soupsieve.compile(', '.join((
+    '.rate-value',
+    '.current-rate',
+    '.mortgage-rate',
+    '[data-rate]',
+    '.mnd-rate',
+    '.today-rate',
+)))
+
+_FREDDIEMAC_SELECTOR = soupsieve.compile(', '.join((
+    '.rate-value',
+    '.current-rate',
+    '.mortgage-rate',
+    '.pmms-rate',
+    '.rate',
+    '.apr',
+    '[class*="rate"]',
+    '[class*="apr"]',
+    '.rate-display',
+    '.rate-number',
+    '.primary-mortgage-market-survey',
+    '.survey-rate',
+    '.pmm-rate',
+)))
+
+_ZILLOW_SELECTOR = soupsieve.compile(', '.join((
+    '.rate-value',
+    '.current-rate',
+    '.mortgage-rate',
+    '.zillow-rate',
+    '[data-testid*="rate"]',
+)))
+
+_NERDWALLET_SELECTOR = soupsieve.compile(', '.join((
+    '.rate-value',
+    '.current-rate',
+    '.mortgage-rate',
+    '.nerdwallet-rate',
+    '[data-testid*="rate"]',
+)))
+
+
+def _summarize_rates(rates: List[float]) -> Dict[str, float]:
+    """Median, mean, sample stdev, min and max of a non-empty list of rates
+    
+    The list is sorted once for the median and the extremes, and the mean
+    is shared with the standard deviation instead of being recomputed.
+    """
+    ordered = sorted(rates)
+    n = len(ordered)
+    mid = n // 2
+    median = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    mean = statistics.fmean(ordered)
+    return {
+        'median': median,
+        'mean': mean,
+        'stdev': statistics.stdev(ordered, mean) if n > 1 else 0.0,
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+
+
+# Retries per request, handled by the session's HTTPAdapter
+REQUEST_RETRIES = 3
+
+
+class _DeadlineRetry(Retry):
+    """Retry that stops before an attempt could run past the source deadline
+    
+    Outside an aggregation round it behaves like Retry. Inside one, a retry
+    is only made if its backoff or Retry-After wait plus the attempt's
+    timeout still ends by the thread's deadline; otherwise retrying stops
+    as if exhausted.
+    """
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        deadline = getattr(_source_deadline, 'value', None)
+        if deadline is not None:
+            # The same wait Retry.sleep will use; a zero Retry-After falls
+            # back to the backoff there too
+            wait = None
+            if response is not None and new_retry.respect_retry_after_header:
+                wait = new_retry.get_retry_after(response)
+            if not wait:
+                wait = new_retry.get_backoff_time()
+            attempt_timeout = getattr(_source_deadline, 'attempt_timeout', 0)
+            if time.monotonic() + wait + attempt_timeout > deadline:
+                raise MaxRetryError(_pool, url, error or ResponseError("no time left before source deadline"))
+        return new_retry
+
+
+def _create_session() -> requests.Session:
+    """Create the keep-alive session shared by all scraper instances"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    })
+    # One pool per host; Bankrate's URLs all reuse the same connection.
+    # Transient failures are retried by urllib3 on the pooled connection
+    # with exponential backoff (0s, 2s, 4s), honouring Retry-After, within
+    # the source deadline during an aggregation round.
+    retries = _DeadlineRetry(total=REQUEST_RETRIES, backoff_factor=1,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=frozenset(['GET']),
+                    raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_SHARED_SESSION = _create_session()
+
 
 class EnhancedRateScraper:
     """Enhanced rate scraper with multiple sources and validation"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-        self.rate_sources = {
-            'fred': self._get_fred_rate,
-            'bankrate': self._get_bankrate_rate,
-            'mortgage_news_daily': self._get_mnd_rate,
-            'freddiemac': self._get_freddiemac_rate,
-            'zillow': self._get_zillow_rate,
-            'nerdwallet': self._get_nerdwallet_rate
-        }
+    # Source name -> name of the method that fetches it. Shared by all
+    # instances and resolved with getattr at call time, so there are no
+    # per-instance bound methods to build.
+    _SOURCE_METHODS = {
+        'fred': '_get_fred_rate',
+        'bankrate': '_get_bankrate_rate',
+        'mortgage_news_daily': '_get_mnd_rate',
+        'freddiemac': '_get_freddiemac_rate',
+        'zillow': '_get_zillow_rate',
+        'nerdwallet': '_get_nerdwallet_rate',
+    }
+    
+    def __init__(self, fred_api_key: Optional[str] = None, rate_cache: Optional[AdaptiveTTLCache] = None,
+                 min_request_interval: float = MIN_REQUEST_INTERVAL):
+        # Resolved FRED key from Config; None falls back to the environment
+        self.fred_api_key = fred_api_key
+        # Politeness delay between requests to the same host; 0 disables it
+        self.min_request_interval = min_request_interval
+        # Per-source rate cache consulted by get_aggregated_rate; the only
+        # cache layer, kept in memory unless a persisted one is given
+        self.rate_cache = rate_cache if rate_cache is not None else AdaptiveTTLCache()
+        self.session = _SHARED_SESSION
     
-    def get_aggregated_rate(self, preferred_sources: List[str] = None) -> Tuple[Optional[float], Dict[str, Any]]:
+    @property
+    def rate_sources(self) -> Dict[str, Callable[[], Optional[float]]]:
+        """Source name -> bound method that fetches its rate, built on access"""
+        return {source: getattr(self, method) for source, method in self._SOURCE_METHODS.items()}
+    
+    def _wait_for_sources(self, futures: Dict[str, Future], known_rates: Dict[str, float],
+                          deadline: float) -> bool:
+        """Wait for source futures until all finish, the deadline passes, or the result is settled
+        
+        The result is settled once EARLY_EXIT_MIN_SOURCES valid rates
+        (including known_rates, source -> rate) already give high
+        confidence; later sources could not change the median meaningfully.
+        Returns True if it stopped early for that reason.
+        """
+        valid_rates = list(known_rates.values())
+        valid_sources = list(known_rates)
+        sources_by_future = {future: source for source, future in futures.items()}
+        try:
+            for future in as_completed(sources_by_future, timeout=max(0.0, deadline - time.monotonic())):
+                if future.exception() is not None:
+                    continue
+                rate = future.result()
+                if rate and self._validate_rate(rate):
+                    valid_rates.append(rate)
+                    valid_sources.append(sources_by_future[future])
+                if (len(valid_rates) >= EARLY_EXIT_MIN_SOURCES and len(futures) > 1
+                        and self._calculate_confidence(valid_rates, valid_sources) == 'high'):
+                    return not all(f.done() for f in futures.values())
+        except FuturesTimeoutError:
+            pass
+        return False
+    
+    def _run_source(self, source: str, deadline: float) -> Optional[float]:
+        """Fetch one source in a worker thread, bounding its requests by deadline"""
+        _source_deadline.value = deadline
+        try:
+            return getattr(self, self._SOURCE_METHODS[source])()
+        finally:
+            _source_deadline.value = None
+    
+    def get_aggregated_rate(self, preferred_sources: Sequence[str] = None,
+                            refresh: bool = False) -> Tuple[Optional[float], Dict[str, Any]]:
         """
         Get aggregated rate from multiple sources
         
+        Sources with a fresh entry in rate_cache are not fetched again;
+        refresh=True fetches every source.
+        
         Returns:
             Tuple of (aggregated_rate, source_data)
         """
@@ -46,24 +336,66 @@ class EnhancedRateScraper:
         source_rates = {}
         successful_sources = []
         
-        logger.info(f"Fetching rates from sources: {preferred_sources}")
+        logger.info("Fetching rates from sources: %s", preferred_sources)
         
-        # Fetch from all sources
+        # Fetch from all sources concurrently; each source is I/O bound, so
+        # total latency is the slowest source rather than the sum of all
+        known_sources = [source for source in preferred_sources if source in self._SOURCE_METHODS]
         for source in preferred_sources:
-            if source in self.rate_sources:
-                try:
-                    rate = self.rate_sources[source]()
-                    if rate and self._validate_rate(rate):
-                        source_rates[source] = rate
+            if source not in self._SOURCE_METHODS:
+                logger.warning("Unknown source: %s", source)
+        
+        # Sources whose cached rate is still within its adaptive TTL
+        cached_rates = {}
+        if not refresh:
+            for source in known_sources:
+                rate = self.rate_cache.get(source)
+                if rate is not None:
+                    cached_rates[source] = rate
+        to_fetch = [source for source in known_sources if source not in cached_rates]
+        
+        if known_sources:
+            executor = ThreadPoolExecutor(max_workers=len(to_fetch)) if to_fetch else None
+            deadline = time.monotonic() + SOURCE_TIMEOUT
+            try:
+                futures = {source: executor.submit(self._run_source, source, deadline) for source in to_fetch}
+                settled = bool(futures) and self._wait_for_sources(futures, cached_rates, deadline)
+                
+                # Collect in preference order so results are deterministic
+                for source in known_sources:
+                    if source in cached_rates:
+                        source_rates[source] = cached_rates[source]
                         successful_sources.append(source)
-                        logger.info(f"[OK] {source}: {rate}%")
-                    else:
-                        logger.warning(f"[FAIL] {source}: Invalid rate {rate}")
-                except Exception as e:
-                    logger.error(f"[ERROR] {source}: Error - {e}")
-                    source_rates[source] = None
-            else:
-                logger.warning(f"Unknown source: {source}")
+                        logger.info("[CACHED] %s: %s%%", source, cached_rates[source])
+                        continue
+                    future = futures[source]
+                    if not future.done():
+                        future.cancel()
+                        if settled:
+                            logger.info("[SKIP] %s: not needed, other sources already agree", source)
+                        else:
+                            logger.error("[ERROR] %s: Timed out after %ss", source, SOURCE_TIMEOUT)
+                            source_rates[source] = None
+                        continue
+                    try:
+                        rate = future.result()
+                        if rate and self._validate_rate(rate):
+                            source_rates[source] = rate
+                            successful_sources.append(source)
+                            logger.info("[OK] %s: %s%%", source, rate)
+                            self.rate_cache.put(source, rate, max_ttl=SOURCE_MAX_TTL.get(source))
+                        else:
+                            logger.warning("[FAIL] %s: Invalid rate %s", source, rate)
+                    except Exception as e:
+                        logger.error("[ERROR] %s: Error - %s", source, e)
+                        source_rates[source] = None
+            finally:
+                # Don't block on slow sources past the deadline; their
+                # requests are bounded by it, so the threads end shortly
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            
+            self.rate_cache.save()
         
         # Calculate aggregated rate
         valid_rates = [rate for rate in source_rates.values() if rate is not None]
@@ -72,8 +404,10 @@ class EnhancedRateScraper:
             logger.error("No valid rates found from any source")
             return None, {'error': 'No valid rates found', 'sources': source_rates}
         
+        summary = _summarize_rates(valid_rates)
+        
         # Use median for more robust aggregation
-        aggregated_rate = round(statistics.median(valid_rates), 3)
+        aggregated_rate = round(summary['median'], 3)
         
         # Calculate additional statistics
         source_data = {
@@ -81,41 +415,38 @@ class EnhancedRateScraper:
             'source_rates': source_rates,
             'successful_sources': successful_sources,
             'rate_count': len(valid_rates),
-            'min_rate': min(valid_rates),
-            'max_rate': max(valid_rates),
-            'average_rate': round(statistics.mean(valid_rates), 3),
-            'rate_spread': round(max(valid_rates) - min(valid_rates), 3),
-            'confidence': self._calculate_confidence(valid_rates, successful_sources)
+            'min_rate': summary['min'],
+            'max_rate': summary['max'],
+            'average_rate': round(summary['mean'], 3),
+            'rate_spread': round(summary['max'] - summary['min'], 3),
+            'confidence': self._calculate_confidence(valid_rates, successful_sources,
+                                                     summary['mean'], summary['stdev'])
         }
         
-        logger.info(f"Aggregated rate: {aggregated_rate}% (from {len(valid_rates)} sources)")
-        logger.info(f"Rate range: {source_data['min_rate']}% - {source_data['max_rate']}%")
+        logger.info("Aggregated rate: %s%% (from %s sources)", aggregated_rate, len(valid_rates))
+        logger.info("Rate range: %s%% - %s%%", source_data['min_rate'], source_data['max_rate'])
         
         return aggregated_rate, source_data
     
     def _validate_rate(self, rate: float) -> bool:
-        """Validate that a rate is realistic"""
-        if not isinstance(rate, (int, float)):
-            return False
-        
-        # Reasonable mortgage rate range: 2% to 15%
-        if not (2.0 <= rate <= 15.0):
-            return False
-        
-        # Check for suspicious values
-        if rate == 0 or rate > 20:
-            return False
-        
-        return True
+        """Validate that a rate is realistic (a number from 2% to 15%)"""
+        # Source methods may return anything, so the type is still checked
+        return isinstance(rate, (int, float)) and _MIN_RATE <= rate <= _MAX_RATE
     
-    def _calculate_confidence(self, rates: List[float], sources: List[str]) -> str:
-        """Calculate confidence level based on rate consistency and source count"""
+    def _calculate_confidence(self, rates: List[float], sources: List[str],
+                              mean_rate: Optional[float] = None, std_dev: Optional[float] = None) -> str:
+        """Calculate confidence level based on rate consistency and source count
+        
+        mean_rate and std_dev can be passed in when already computed.
+        """
         if len(rates) < 2:
             return 'low'
         
         # Calculate coefficient of variation (standard deviation / mean)
-        mean_rate = statistics.mean(rates)
-        std_dev = statistics.stdev(rates)
+        if mean_rate is None:
+            mean_rate = statistics.fmean(rates)
+        if std_dev is None:
+            std_dev = statistics.stdev(rates, mean_rate)
         cv = std_dev / mean_rate if mean_rate > 0 else 1
         
         # High confidence: multiple sources with low variance
@@ -129,76 +460,108 @@ class EnhancedRateScraper:
             return 'low'
     
     def _make_request(self, url: str, **kwargs) -> Optional[requests.Response]:
-        """Make HTTP request with error handling and retries"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Add random delay to be respectful
-                time.sleep(random.uniform(1, 3))
-                response = self.session.get(url, timeout=30, **kwargs)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                logger.warning(f"Request attempt {attempt + 1} failed for {url}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    logger.error(f"All {max_retries} attempts failed for {url}")
-        return None
+        """Make HTTP request with error handling; retries happen in the session adapter
+        
+        Inside an aggregation round each attempt's timeout is capped at the
+        time left before the round's deadline, no request is started once it
+        has passed, and the adapter only retries while an attempt still fits
+        before it (see _DeadlineRetry).
+        """
+        try:
+            # Be respectful: space out requests to the same host
+            _throttle(url, self.min_request_interval)
+            timeout = REQUEST_TIMEOUT
+            deadline = getattr(_source_deadline, 'value', None)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Skipping request for %s: source deadline passed", url)
+                    return None
+                timeout = min(timeout, remaining)
+                _source_deadline.attempt_timeout = timeout
+            response = self.session.get(url, timeout=timeout, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            # The adapter's MaxRetryError already says when retries ran out
+            logger.error("Request failed for %s: %s", url, e)
+            return None
     
     def _extract_rate_from_text(self, text: str) -> Optional[float]:
         """Extract rate percentage from text with improved patterns"""
         if not text:
             return None
         
-        # Clean the text
-        text = text.strip()
-        
-        # Look for various rate patterns
-        patterns = [
-            r'(\d+\.\d+)%',  # 5.25%
-            r'(\d+\.\d+)\s*percent',  # 5.25 percent
-            r'rate[:\s]*(\d+\.\d+)',  # rate: 5.25
-            r'(\d+\.\d+)\s*APR',  # 5.25 APR
-            r'(\d+\.\d+)\s*interest',  # 5.25 interest
-            r'(\d+\.\d+)\s*fixed',  # 5.25 fixed
-            r'(\d+\.\d+)\s*refinance',  # 5.25 refinance
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    rate = float(match.group(1))
-                    if self._validate_rate(rate):
-                        return rate
-                except ValueError:
-                    continue
+        for match in _RATE_RE.finditer(text):
+            rate = float(match.group(1) or match.group(2))
+            if self._validate_rate(rate):
+                return rate
         
         return None
     
     def _find_rate_in_text(self, text: str) -> Optional[float]:
         """Find any reasonable rate percentage in text"""
-        # Look for any percentage pattern
-        matches = re.findall(r'(\d+\.\d+)%', text)
-        for match in matches:
-            try:
-                rate = float(match)
-                if self._validate_rate(rate):
+        match = _VALID_RATE_RE.search(text)
+        return float(match.group(1)) if match else None
+    
+    def _fast_rate_from_bytes(self, content: bytes) -> Optional[float]:
+        """Find a rate-classed percentage in the raw page without building a DOM"""
+        for match in _FAST_RATE_RE.finditer(content):
+            rate = float(match.group(1))
+            if self._validate_rate(rate):
+                return rate
+        return None
+    
+    def _parse_rate_from_html(self, content: bytes, selector: soupsieve.SoupSieve,
+                              fallback: bool = True, fast_path: bool = False) -> Optional[float]:
+        """Find a rate in an HTML page using a CSS selector
+        
+        With fast_path, a regex scan of the raw bytes is tried first and
+        usually avoids parsing entirely; only use it for selectors that
+        already match any rate-classed element ([class*="rate"]), since it
+        would otherwise bypass a narrower selector. Elements matching the
+        selector are tried in document order; with fallback, the whole page
+        text is searched for a percentage when no element yields a valid rate.
+        """
+        if fast_path:
+            rate = self._fast_rate_from_bytes(content)
+            if rate:
+                return rate
+        
+        soup = BeautifulSoup(content, 'lxml')
+        
+        for element in selector.select(soup):
+            rate = self._extract_rate_from_text(element.get_text(strip=True))
+            if rate:
+                return rate
+        
+        if fallback:
+            # Walk the text nodes lazily and stop at the first hit rather
+            # than joining the whole document into one string
+            for text in soup.strings:
+                rate = self._find_rate_in_text(text)
+                if rate:
                     return rate
-            except ValueError:
-                continue
+        return None
+    
+    def _fetch_and_parse(self, url: str, selector: soupsieve.SoupSieve,
+                         fallback: bool = True, fast_path: bool = False) -> Optional[float]:
+        """Fetch a page and extract a rate from it"""
+        response = self._make_request(url)
+        if response:
+            return self._parse_rate_from_html(response.content, selector, fallback, fast_path)
         return None
     
     # Source-specific scrapers
     def _get_fred_rate(self) -> Optional[float]:
         """Get rate from FRED (Federal Reserve Economic Data)"""
         try:
-            series_id = "MORTGAGE30US"
-            api_key = os.getenv('FRED_API_KEY', '')
+            api_key = self.fred_api_key
+            if api_key is None:
+                api_key = os.getenv('FRED_API_KEY', '')
             
             if api_key:
-                url = f"https://api.stlouisfed.org/fred/series/observations?series_id={series_id}&api_key={api_key}&file_type=json&limit=1&sort_order=desc"
+                url = _FRED_API_URL.format(series_id=FRED_SERIES_ID, api_key=api_key)
                 response = self._make_request(url)
                 
                 if response:
@@ -208,27 +571,28 @@ class EnhancedRateScraper:
                         if rate_str != '.' and rate_str:
                             return float(rate_str)
             else:
-                # Use public CSV endpoint
-                url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}&cosd=2024-01-01"
+                # Use public CSV endpoint, asking only for the last few weeks
+                start = (date.today() - timedelta(days=FRED_CSV_WINDOW_DAYS)).isoformat()
+                url = _FRED_CSV_URL.format(series_id=FRED_SERIES_ID, start=start)
                 response = self._make_request(url)
                 
                 if response:
-                    lines = response.text.strip().split('\n')
-                    if len(lines) > 1:
-                        for line in reversed(lines[1:]):
-                            parts = line.split(',')
-                            if len(parts) >= 2:
-                                try:
-                                    rate_str = parts[1].strip().strip('"')
-                                    if rate_str and rate_str != '.':
-                                        return float(rate_str)
-                                except (ValueError, IndexError):
-                                    continue
+                    # Rows are oldest first; walk back from the end to the
+                    # latest observation, skipping FRED's '.' missing values;
+                    # values may be quoted
+                    for line in reversed(response.text.strip().splitlines()[1:]):
+                        rate_str = line.rpartition(',')[2].strip().strip('"')
+                        if rate_str and rate_str != '.':
+                            try:
+                                return float(rate_str)
+                            except ValueError:
+                                continue
+                    return None
             
             return None
             
         except Exception as e:
-            logger.error(f"Error getting FRED rate: {e}")
+            logger.error("Error getting FRED rate: %s", e)
             return None
     
     def _get_bankrate_rate(self) -> Optional[float]:
@@ -242,129 +606,37 @@ class EnhancedRateScraper:
                 "https://www.bankrate.com/mortgage-rates/"
             ]
             
+            # One host, so _throttle serializes these anyway; fetching in
+            # order means no page is requested after the first rate is found
             for url in urls:
-                response = self._make_request(url)
-                if response:
-                    soup = BeautifulSoup(response.content, 'html5lib')
-                    
-                    # Updated selectors for current Bankrate layout
-                    rate_selectors = [
-                        '.rate-value',
-                        '.current-rate',
-                        '.mortgage-rate',
-                        '.refinance-rate',
-                        '.rate',
-                        '.apr',
-                        '.interest-rate',
-                        '[data-testid*="rate"]',
-                        '[class*="rate"]',
-                        '[class*="apr"]',
-                        '.rate-display',
-                        '.rate-number',
-                        '.primary-rate',
-                        '.main-rate'
-                    ]
-                    
-                    for selector in rate_selectors:
-                        rate_elements = soup.select(selector)
-                        for element in rate_elements:
-                            rate_text = element.get_text().strip()
-                            rate = self._extract_rate_from_text(rate_text)
-                            if rate:
-                                return rate
-                    
-                    # Fallback: look for any percentage pattern
-                    rate = self._find_rate_in_text(soup.get_text())
-                    if rate:
-                        return rate
+                rate = self._fetch_and_parse(url, _BANKRATE_SELECTOR, fast_path=True)
+                if rate:
+                    return rate
             
             return None
             
         except Exception as e:
-            logger.error(f"Error scraping Bankrate: {e}")
+            logger.error("Error scraping Bankrate: %s", e)
             return None
     
     def _get_mnd_rate(self) -> Optional[float]:
         """Get rate from Mortgage News Daily"""
         try:
             url = "https://www.mortgagenewsdaily.com/mortgage-rates"
-            response = self._make_request(url)
-            
-            if response:
-                soup = BeautifulSoup(response.content, 'html5lib')
-                
-                # Look for rate information
-                rate_selectors = [
-                    '.rate-value',
-                    '.current-rate',
-                    '.mortgage-rate',
-                    '[data-rate]',
-                    '.mnd-rate',
-                    '.today-rate'
-                ]
-                
-                for selector in rate_selectors:
-                    rate_elements = soup.select(selector)
-                    for element in rate_elements:
-                        rate_text = element.get_text().strip()
-                        rate = self._extract_rate_from_text(rate_text)
-                        if rate:
-                            return rate
-                
-                # Fallback: look for any percentage pattern
-                rate = self._find_rate_in_text(soup.get_text())
-                if rate:
-                    return rate
-            
-            return None
+            return self._fetch_and_parse(url, _MND_SELECTOR)
             
         except Exception as e:
-            logger.error(f"Error scraping Mortgage News Daily: {e}")
+            logger.error("Error scraping Mortgage News Daily: %s", e)
             return None
     
     def _get_freddiemac_rate(self) -> Optional[float]:
         """Get rate from Freddie Mac PMMS"""
         try:
             url = "https://www.freddiemac.com/pmms/"
-            response = self._make_request(url)
-            
-            if response:
-                soup = BeautifulSoup(response.content, 'html5lib')
-                
-                # Look for the 30-year fixed rate
-                rate_selectors = [
-                    '.rate-value',
-                    '.current-rate',
-                    '.mortgage-rate',
-                    '.pmms-rate',
-                    '.rate',
-                    '.apr',
-                    '[class*="rate"]',
-                    '[class*="apr"]',
-                    '.rate-display',
-                    '.rate-number',
-                    '.primary-mortgage-market-survey',
-                    '.survey-rate',
-                    '.pmm-rate'
-                ]
-                
-                for selector in rate_selectors:
-                    rate_elements = soup.select(selector)
-                    for element in rate_elements:
-                        rate_text = element.get_text().strip()
-                        rate = self._extract_rate_from_text(rate_text)
-                        if rate:
-                            return rate
-                
-                # Fallback: look for any percentage pattern
-                rate = self._find_rate_in_text(soup.get_text())
-                if rate:
-                    return rate
-            
-            return None
+            return self._fetch_and_parse(url, _FREDDIEMAC_SELECTOR, fast_path=True)
             
         except Exception as e:
-            logger.error(f"Error scraping Freddie Mac: {e}")
+            logger.error("Error scraping Freddie Mac: %s", e)
             return None
     
     def _get_zillow_rate(self) -> Optional[float]:
@@ -377,75 +649,36 @@ class EnhancedRateScraper:
             ]
             
             for url in urls:
-                response = self._make_request(url)
-                if response:
-                    soup = BeautifulSoup(response.content, 'html5lib')
-                    
-                    # Look for rate information
-                    rate_selectors = [
-                        '.rate-value',
-                        '.current-rate',
-                        '.mortgage-rate',
-                        '.zillow-rate',
-                        '[data-testid*="rate"]'
-                    ]
-                    
-                    for selector in rate_selectors:
-                        rate_elements = soup.select(selector)
-                        for element in rate_elements:
-                            rate_text = element.get_text().strip()
-                            rate = self._extract_rate_from_text(rate_text)
-                            if rate:
-                                return rate
+                rate = self._fetch_and_parse(url, _ZILLOW_SELECTOR, fallback=False)
+                if rate:
+                    return rate
             
             return None
             
         except Exception as e:
-            logger.error(f"Error scraping Zillow: {e}")
+            logger.error("Error scraping Zillow: %s", e)
             return None
     
     def _get_nerdwallet_rate(self) -> Optional[float]:
         """Get rate from NerdWallet (if available)"""
         try:
             url = "https://www.nerdwallet.com/mortgages/mortgage-rates"
-            response = self._make_request(url)
-            
-            if response:
-                soup = BeautifulSoup(response.content, 'html5lib')
-                
-                # Look for rate information
-                rate_selectors = [
-                    '.rate-value',
-                    '.current-rate',
-                    '.mortgage-rate',
-                    '.nerdwallet-rate',
-                    '[data-testid*="rate"]'
-                ]
-                
-                for selector in rate_selectors:
-                    rate_elements = soup.select(selector)
-                    for element in rate_elements:
-                        rate_text = element.get_text().strip()
-                        rate = self._extract_rate_from_text(rate_text)
-                        if rate:
-                            return rate
-            
-            return None
+            return self._fetch_and_parse(url, _NERDWALLET_SELECTOR, fallback=False)
             
         except Exception as e:
-            logger.error(f"Error scraping NerdWallet: {e}")
+            logger.error("Error scraping NerdWallet: %s", e)
             return None
 
 
 # Factory function for backward compatibility
+@functools.lru_cache(maxsize=None)
 def get_enhanced_rate_scraper() -> EnhancedRateScraper:
-    """Get enhanced rate scraper instance"""
+    """Get the shared enhanced rate scraper instance"""
     return EnhancedRateScraper()
 
 
 # Mock rate for testing when all sources fail
 def get_mock_rate() -> float:
     """Return a mock rate for testing purposes"""
-    import random
     # Return a random rate between 4.5% and 6.5% for testing
     return round(random.uniform(4.5, 6.5), 2)
@@ -0,0 +1,131 @@
+"""
+Adaptive TTL cache for per-source rate lookups
+
+Most rate sources publish at most daily (FRED and Freddie Mac weekly), so a
+value that hasn't changed for a while is unlikely to change in the next few
+minutes either. Each source's TTL is a fraction of how long its rate has
+been stable: TTL = (now - last_changed) * alpha, clamped to [min_ttl, max_ttl].
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fraction of a rate's observed stable age that it is trusted for
+DEFAULT_ALPHA = 0.5
+
+# TTL bounds (seconds): never cache for less than 5 minutes or more than a day
+DEFAULT_MIN_TTL = 5 * 60
+DEFAULT_MAX_TTL = 24 * 60 * 60
+
+# Fraction of an entry's TTL after which lookups start refreshing it early,
+# with a probability that grows linearly to 1 at the TTL, so processes
+# sharing a cache file don't all refetch a source at the same instant
+DEFAULT_EARLY_REFRESH = 0.8
+
+
+class AdaptiveTTLCache:
+    """Per-source rate cache, persisted as JSON when given a path
+
+    Entries are keyed by source name and hold the rate, when it was fetched,
+    when it last changed and the TTL derived from that. Without a path the
+    entries only live as long as the cache object.
+    """
+
+    def __init__(self, path: Optional[str] = None, alpha: float = DEFAULT_ALPHA,
+                 min_ttl: float = DEFAULT_MIN_TTL, max_ttl: float = DEFAULT_MAX_TTL,
+                 early_refresh: float = DEFAULT_EARLY_REFRESH):
+        self.path = Path(path) if path is not None else None
+        self.alpha = alpha
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        # 1.0 disables early refresh
+        self.early_refresh = early_refresh
+        # Guards _entries and _dirty; a scraper may be shared between threads
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the persisted entries, starting empty if the file is missing or corrupt"""
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable rate cache %s: %s", self.path, e)
+            return {}
+
+    def get(self, source: str, now: Optional[float] = None) -> Optional[float]:
+        """Return the cached rate for source if it is still fresh, else None
+        
+        Past early_refresh of the TTL an entry may already be reported
+        stale, see DEFAULT_EARLY_REFRESH.
+        """
+        entry = self._entries.get(source)
+        if entry is None:
+            return None
+        if now is None:
+            now = time.time()
+        age, ttl = now - entry['fetched_at'], entry['ttl']
+        if age >= ttl:
+            return None
+        early = ttl * self.early_refresh
+        if age >= early and random.random() < (age - early) / (ttl - early):
+            return None
+        return entry['rate']
+
+    def put(self, source: str, rate: float, now: Optional[float] = None,
+            max_ttl: Optional[float] = None):
+        """Record a freshly fetched rate and recompute the source's TTL
+
+        max_ttl caps the TTL for this source below the cache-wide maximum,
+        for sources known to update more often.
+        """
+        if max_ttl is None:
+            max_ttl = self.max_ttl
+        if now is None:
+            now = time.time()
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is not None and entry['rate'] == rate:
+                last_changed = entry['last_changed']
+            else:
+                last_changed = now
+            ttl = min(max_ttl, max(self.min_ttl, (now - last_changed) * self.alpha))
+            self._entries[source] = {
+                'rate': rate,
+                'fetched_at': now,
+                'last_changed': last_changed,
+                'ttl': ttl,
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the entries back to disk if anything changed and there is a path"""
+        if self.path is None:
+            return
+        try:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file and swap so a crash never leaves half a file
+                tmp_path = self.path.with_name(self.path.name + '.tmp')
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._entries, f, indent=2)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+        except OSError as e:
+            logger.warning("Failed to save rate cache %s: %s", self.path, e)
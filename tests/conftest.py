@@ -0,0 +1,52 @@
+"""
+Shared pytest setup for the Mortgage Alert tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports (once for the whole session)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# Import the package modules up front so test modules share the warm imports
+import mortgage_alert.core.alert_system  # noqa: E402,F401
+import mortgage_alert.core.config  # noqa: E402,F401
+import mortgage_alert.data.data_manager  # noqa: E402,F401
+import mortgage_alert.scrapers.rate_scraper  # noqa: E402,F401
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-network", action="store_true", default=False,
+                     help="run tests marked 'network' that call the real rate sources")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: test calls the real rate sources (needs --run-network)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip network tests unless --run-network is given"""
+    if config.getoption("--run-network"):
+        return
+    skip = pytest.mark.skip(reason="network tests disabled (use --run-network)")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def bulk_save():
+    """Return a helper that writes test rates with one RateDataManager.save_rates call
+    
+    Record i gets source "test{i}", so the rows match a loop of save_rate calls.
+    """
+    def _bulk_save(data_manager, rates):
+        records = [
+            {'rate': rate, 'source': f"test{i}", 'target_rate': 6.0, 'state': "Oregon",
+             'alert_sent': False, 'daily_report_sent': False, 'notes': f"Test rate {i}"}
+            for i, rate in enumerate(rates)
+        ]
+        assert data_manager.save_rates(records)
+    return _bulk_save
@@ -3,61 +3,83 @@ Tests for the AlertSystem class
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from unittest.mock import patch
 
 from mortgage_alert.core.alert_system import AlertSystem
-from mortgage_alert.core.config import config
+from mortgage_alert.core.config import Config
 
 
 class TestAlertSystem:
     """Test cases for AlertSystem"""
     
-    def test_alert_system_initialization(self):
+    @pytest.fixture
+    def settings(self, tmp_path):
+        """A private Config for one test, storing its data and cache in tmp_path"""
+        settings = Config()
+        settings.data_dir = str(tmp_path)
+        settings.cache_dir = str(tmp_path)
+        settings.target_rate = 6.0
+        return settings
+    
+    @pytest.fixture
+    def alert_system(self, settings):
+        """Create an AlertSystem using the test's own settings"""
+        return AlertSystem(settings=settings)
+    
+    @pytest.fixture(autouse=True)
+    def no_network(self, alert_system):
+        """Replace the rate lookup so no test reaches the real rate sources"""
+        source_data = {'successful_sources': ['mock'], 'confidence': 'high'}
+        with patch.object(alert_system.rate_scraper, 'get_aggregated_rate',
+                          return_value=(5.25, source_data)) as mock_rate:
+            yield mock_rate
+    
+    def test_alert_system_initialization(self, alert_system, settings):
         """Test that AlertSystem initializes correctly"""
-        alert_system = AlertSystem()
         assert alert_system is not None
+        assert alert_system.config is settings
         assert alert_system.rate_scraper is not None
         assert alert_system.data_manager is not None
     
-    def test_should_send_alert_daily_report(self):
-        """Test alert logic when daily report is enabled"""
-        # Mock daily report enabled
-        original_daily_report = config.daily_report
-        config.daily_report = True
-        
-        alert_system = AlertSystem()
+    @pytest.mark.parametrize("daily_report,rate,expected", [
+        # Daily report enabled: always send
+        (True, 7.0, True),   # Above target
+        (True, 5.0, True),   # Below target
+        # Threshold alerts only: send when below target
+        (False, 7.0, False),  # Above target
+        (False, 5.0, True),   # Below target
+    ])
+    def test_should_send_alert(self, alert_system, settings, daily_report, rate, expected):
+        """Test alert logic with and without the daily report"""
+        settings.daily_report = daily_report
         
-        # Should always send when daily report is enabled
-        assert alert_system.should_send_alert(7.0) == True  # Above target
-        assert alert_system.should_send_alert(5.0) == True  # Below target
-        
-        # Restore original value
-        config.daily_report = original_daily_report
+        assert alert_system.should_send_alert(rate) is expected
     
-    def test_should_send_alert_threshold_only(self):
-        """Test alert logic when only threshold alerts are enabled"""
-        # Mock daily report disabled
-        original_daily_report = config.daily_report
-        config.daily_report = False
-        
-        alert_system = AlertSystem()
-        
-        # Should only send when below target
-        assert alert_system.should_send_alert(7.0) == False  # Above target
-        assert alert_system.should_send_alert(5.0) == True   # Below target
+    @pytest.mark.parametrize("send", [True, False])
+    def test_run_alert_check_uses_should_send_alert(self, alert_system, settings, send):
+        """Test that the alert check notifies exactly when should_send_alert says so"""
+        with patch.object(settings, 'validate', return_value={'valid': True}), \
+             patch.object(alert_system, 'should_send_alert', return_value=send) as should_send, \
+             patch.object(alert_system, 'send_notification', return_value=True) as notify:
+            assert alert_system.run_alert_check() == True
         
-        # Restore original value
-        config.daily_report = original_daily_report
+        should_send.assert_called_once_with(5.25)
+        assert notify.called == send
+        assert alert_system.data_manager.get_metadata()['total_records'] == 1
     
-    def test_get_current_rate(self):
+    def test_get_current_rate(self, alert_system, no_network):
         """Test getting current rate"""
-        alert_system = AlertSystem()
         rate, source_data = alert_system.get_current_rate()
         
+        assert rate == 5.25
+        assert source_data['successful_sources'] == ['mock']
+        no_network.assert_called_once()
+    
+    @pytest.mark.network
+    def test_get_current_rate_live(self):
+        """Test getting the current rate from the real sources"""
+        rate, source_data = AlertSystem().get_current_rate()
+        
         # Should return either a valid rate or None
         if rate is not None:
             assert isinstance(rate, (int, float))
@@ -0,0 +1,74 @@
+"""
+Tests for the command line interface helpers
+"""
+
+import json
+import logging
+import sys
+import time
+import pytest
+from unittest.mock import patch
+
+from mortgage_alert import cli
+from mortgage_alert.cli import LOG_FORMATTER
+from mortgage_alert.data.data_manager import RateDataManager
+
+
+class TestSetupLogging:
+    """Test cases for setup_logging"""
+    
+    @pytest.fixture
+    def root_logger(self):
+        """Restore the root logger's handlers and level after the test"""
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        yield root
+        for handler in root.handlers:
+            handler.close()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+    
+    def test_log_file_written_live(self, root_logger, tmp_path):
+        """Test that records reach the log file immediately, without a flush at exit"""
+        log_file = tmp_path / "alert.log"
+        with patch.object(cli, 'LOG_FILE', str(log_file)):
+            cli.setup_logging("INFO")
+        
+        logging.getLogger("mortgage_alert.test").info("rate check started")
+        assert "rate check started" in log_file.read_text()
+
+
+class TestRebuildMetadata:
+    """Test cases for the rebuild-metadata command"""
+    
+    def test_rebuild_metadata_command(self, tmp_path, monkeypatch, capsys):
+        """Test that the command repairs total_records in the configured data directory"""
+        dm = RateDataManager(str(tmp_path))
+        dm.save_rate(rate=5.25, source="fred", target_rate=6.0, state="Oregon")
+        metadata = json.loads(dm.metadata_file.read_text())
+        metadata['total_records'] = 0
+        dm.metadata_file.write_text(json.dumps(metadata))
+        
+        monkeypatch.setattr(cli.config, 'data_dir', str(tmp_path))
+        monkeypatch.setattr(sys, 'argv', ['mortgage-alert', 'rebuild-metadata'])
+        
+        with patch.object(cli, 'setup_logging'):
+            assert cli.main() == 0
+        assert "Metadata rebuilt: 1 records" in capsys.readouterr().out
+        assert json.loads(dm.metadata_file.read_text())['total_records'] == 1
+
+
+class TestLogFormatter:
+    """Test cases for the cached-timestamp log formatter"""
+    
+    def _record(self, created: float) -> logging.LogRecord:
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return record
+    
+    def test_timestamps_match_each_records_second(self):
+        """Test that interleaved records from different seconds keep their own time"""
+        for created in [1000.25, 2000.5, 1000.75, 2000.0]:
+            expected = time.strftime(LOG_FORMATTER.default_time_format, LOG_FORMATTER.converter(created))
+            assert LOG_FORMATTER.formatTime(self._record(created)).startswith(expected)
@@ -2,24 +2,41 @@
 Tests for the Config class
 """
 
-import pytest
+import functools
 import os
-import sys
-from pathlib import Path
+import pytest
 from unittest.mock import patch
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from mortgage_alert.core.config import Config
 
 
+@functools.lru_cache(maxsize=32)
+def _config_for(env_items):
+    """Build a Config with env_items (a frozenset of (key, value) pairs) set
+    
+    Cached on the env fingerprint, so each distinct environment is parsed
+    once; safe because the tests only read the resulting Config.
+    """
+    with patch.dict(os.environ, dict(env_items), clear=False):
+        return Config()
+
+
 class TestConfig:
     """Test cases for Config class"""
     
-    def test_config_initialization(self):
+    @pytest.fixture(scope="module")
+    def default_config(self):
+        """Build one Config from the unmodified environment"""
+        return Config()
+    
+    @pytest.fixture
+    def config_under_env(self, request):
+        """Config built with the env vars given as the param set"""
+        return _config_for(frozenset(request.param.items()))
+    
+    def test_config_initialization(self, default_config):
         """Test that Config initializes with default values"""
-        config = Config()
+        config = default_config
         assert config.target_rate == 6.0
         assert config.state == "Oregon"
         assert config.notification_method == "email"
@@ -28,42 +45,59 @@ class TestConfig:
         assert config.log_file == "alert.log"
         assert config.data_dir == "data"
     
-    def test_config_environment_variables(self):
+    @pytest.mark.parametrize("config_under_env", [{
+        'TARGET_RATE': '5.5',
+        'STATE': 'California',
+        'NOTIFICATION_METHOD': 'telegram',
+        'DAILY_REPORT': 'true',
+        'LOG_LEVEL': 'DEBUG'
+    }], indirect=True)
+    def test_config_environment_variables(self, config_under_env):
         """Test that Config reads environment variables correctly"""
-        with patch.dict(os.environ, {
-            'TARGET_RATE': '5.5',
-            'STATE': 'California',
-            'NOTIFICATION_METHOD': 'telegram',
-            'DAILY_REPORT': 'true',
-            'LOG_LEVEL': 'DEBUG'
-        }):
-            config = Config()
-            assert config.target_rate == 5.5
-            assert config.state == "California"
-            assert config.notification_method == "telegram"
-            assert config.daily_report == True
-            assert config.log_level == "DEBUG"
+        config = config_under_env
+        assert config.target_rate == 5.5
+        assert config.state == "California"
+        assert config.notification_method == "telegram"
+        assert config.daily_report == True
+        assert config.log_level == "DEBUG"
     
-    def test_config_type_casting(self):
+    @pytest.mark.parametrize("config_under_env", [{'CACHE_DIR': '~/rate-cache'}], indirect=True)
+    def test_config_cache_dir_outside_data(self, config_under_env, default_config):
+        """Test that the rate cache defaults outside data_dir and expands ~"""
+        assert config_under_env.cache_dir == os.path.expanduser('~/rate-cache')
+        if 'CACHE_DIR' not in os.environ:
+            assert default_config.cache_dir == os.path.expanduser('~/.cache/mortgage_alert')
+    
+    @pytest.mark.parametrize("config_under_env", [{
+        'TARGET_RATE': '7.25',
+        'DAILY_REPORT': 'true',
+        'SMTP_PORT': '587'
+    }], indirect=True)
+    def test_config_type_casting(self, config_under_env):
         """Test that Config properly casts environment variable types"""
-        with patch.dict(os.environ, {
-            'TARGET_RATE': '7.25',
-            'SMTP_PORT': '465',
-            'DAILY_REPORT': 'true',
-            'SMTP_PORT': '587'
-        }):
-            config = Config()
-            assert isinstance(config.target_rate, float)
-            assert config.target_rate == 7.25
-            assert isinstance(config.email_config['smtp_port'], int)
-            assert config.email_config['smtp_port'] == 587
-            assert isinstance(config.daily_report, bool)
-            assert config.daily_report == True
+        config = config_under_env
+        assert isinstance(config.target_rate, float)
+        assert config.target_rate == 7.25
+        assert isinstance(config.email_config.smtp_port, int)
+        assert config.email_config.smtp_port == 587
+        assert isinstance(config.daily_report, bool)
+        assert config.daily_report == True
     
-    def test_config_validation(self):
+    @pytest.mark.parametrize("config_under_env", [{
+        'TARGET_RATE': 'six',
+        'SMTP_PORT': '',
+        'DAILY_REPORT': ' YES '
+    }], indirect=True)
+    def test_config_invalid_numbers_fall_back_to_defaults(self, config_under_env):
+        """Test that unparseable numeric variables use the defaults"""
+        config = config_under_env
+        assert config.target_rate == 6.0
+        assert config.email_config.smtp_port == 587
+        assert config.daily_report == True
+    
+    def test_config_validation(self, default_config):
         """Test configuration validation"""
-        config = Config()
-        validation = config.validate()
+        validation = default_config.validate()
         
         # Should have validation keys
         assert 'email' in validation
@@ -78,69 +112,54 @@ class TestConfig:
         # State should be valid (non-empty)
         assert validation['state'] == True
     
-    def test_config_validation_invalid_target_rate(self):
-        """Test validation with invalid target rate"""
-        with patch.dict(os.environ, {'TARGET_RATE': '25'}):
-            config = Config()
-            validation = config.validate()
-            assert validation['target_rate'] == False
-            assert validation['valid'] == False
-    
-    def test_config_validation_invalid_state(self):
-        """Test validation with invalid state"""
-        with patch.dict(os.environ, {'STATE': ''}):
-            config = Config()
-            validation = config.validate()
-            assert validation['state'] == False
-            assert validation['valid'] == False
-    
-    def test_config_email_validation(self):
-        """Test email configuration validation"""
-        # Test with complete email config
-        with patch.dict(os.environ, {
+    @pytest.mark.parametrize("config_under_env, expected", [
+        # Target rate out of range
+        ({'TARGET_RATE': '25'}, {'target_rate': False, 'valid': False}),
+        # Empty state
+        ({'STATE': ''}, {'state': False, 'valid': False}),
+        # Complete email config
+        ({
             'SENDER_EMAIL': 'test@example.com',
             'SENDER_PASSWORD': 'password',
             'RECIPIENT_EMAIL': 'recipient@example.com',
             'NOTIFICATION_METHOD': 'email'
-        }):
-            config = Config()
-            validation = config.validate()
-            assert validation['email'] == True
-        
-        # Test with incomplete email config
-        with patch.dict(os.environ, {
-            'NOTIFICATION_METHOD': 'email'
-            # Missing email credentials
-        }):
-            config = Config()
-            validation = config.validate()
-            assert validation['email'] == False
-    
-    def test_config_telegram_validation(self):
-        """Test telegram configuration validation"""
-        # Test with complete telegram config
-        with patch.dict(os.environ, {
+        }, {'email': True}),
+        # Email selected without credentials
+        ({'NOTIFICATION_METHOD': 'email'}, {'email': False}),
+        # Complete telegram config
+        ({
             'TELEGRAM_BOT_TOKEN': 'bot_token',
             'TELEGRAM_CHAT_ID': 'chat_id',
             'NOTIFICATION_METHOD': 'telegram'
-        }):
-            config = Config()
-            validation = config.validate()
-            assert validation['telegram'] == True
+        }, {'telegram': True}),
+        # Telegram selected without credentials
+        ({'NOTIFICATION_METHOD': 'telegram'}, {'telegram': False}),
+    ], indirect=["config_under_env"])
+    def test_config_validation_cases(self, config_under_env, expected):
+        """Test validation results for specific environment settings"""
+        validation = config_under_env.validate()
+        for key, value in expected.items():
+            assert validation[key] == value, key
+    
+    def test_config_validation_tracks_changes(self):
+        """Test that validate() reflects attribute changes and returns a fresh dict"""
+        config = Config()
+        config.target_rate = 6.0
+        validation = config.validate()
+        assert validation['target_rate'] == True
         
-        # Test with incomplete telegram config
-        with patch.dict(os.environ, {
-            'NOTIFICATION_METHOD': 'telegram'
-            # Missing telegram credentials
-        }):
-            config = Config()
-            validation = config.validate()
-            assert validation['telegram'] == False
+        # Mutating a returned dict doesn't affect later calls
+        validation['valid'] = 'corrupted'
+        assert config.validate()['valid'] != 'corrupted'
+        
+        config.target_rate = 25.0
+        assert config.validate()['target_rate'] == False
+        assert config.get_summary()['target_rate'] == 25.0
+        assert config.get_summary()['validation']['target_rate'] == False
     
-    def test_config_get_summary(self):
+    def test_config_get_summary(self, default_config):
         """Test configuration summary generation"""
-        config = Config()
-        summary = config.get_summary()
+        summary = default_config.get_summary()
         
         assert 'target_rate' in summary
         assert 'state' in summary
@@ -155,10 +174,9 @@ class TestConfig:
         assert isinstance(summary['preferred_sources'], list)
         assert len(summary['preferred_sources']) > 0
     
-    def test_config_repr(self):
+    def test_config_repr(self, default_config):
         """Test string representation of config"""
-        config = Config()
-        repr_str = repr(config)
+        repr_str = repr(default_config)
         assert 'Config(' in repr_str
         assert 'target_rate=' in repr_str
         assert 'state=' in repr_str
@@ -2,38 +2,36 @@
 Tests for the Rate Data Manager
 """
 
+import csv
+import json
 import pytest
 import sys
-import tempfile
-import shutil
 from pathlib import Path
-from datetime import datetime, date
+from datetime import date, timedelta
 from unittest.mock import patch
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from mortgage_alert.data.data_manager import RateDataManager
 
 
-class TestRateDataManager:
-    """Test cases for RateDataManager"""
+class TestRateDataManagerReadOnly:
+    """Test cases that only read a freshly initialized RateDataManager
     
-    @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for testing"""
-        temp_dir = tempfile.mkdtemp()
-        yield temp_dir
-        shutil.rmtree(temp_dir)
+    These share one manager and data directory for the whole module.
+    """
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
+    def temp_dir(self, tmp_path_factory):
+        """Create one temporary directory for the read-only tests"""
+        return tmp_path_factory.mktemp("dm", numbered=True)
+    
+    @pytest.fixture(scope="module")
     def data_manager(self, temp_dir):
-        """Create a RateDataManager instance with temp directory"""
-        return RateDataManager(temp_dir)
+        """Create a RateDataManager instance shared by the read-only tests"""
+        return RateDataManager(str(temp_dir))
     
-    def test_data_manager_initialization(self, temp_dir):
+    def test_data_manager_initialization(self, data_manager, temp_dir):
         """Test that RateDataManager initializes correctly"""
-        dm = RateDataManager(temp_dir)
+        dm = data_manager
         
         assert dm.data_dir == Path(temp_dir)
         assert dm.rates_file == Path(temp_dir) / "rates.csv"
@@ -43,9 +41,9 @@ class TestRateDataManager:
         assert dm.rates_file.exists()
         assert dm.metadata_file.exists()
     
-    def test_initial_files_creation(self, temp_dir):
+    def test_initial_files_creation(self, data_manager):
         """Test that initial files are created with correct structure"""
-        dm = RateDataManager(temp_dir)
+        dm = data_manager
         
         # Check CSV file has header
         with open(dm.rates_file, 'r') as f:
@@ -53,7 +51,6 @@ class TestRateDataManager:
             assert 'date,timestamp,rate,source,target_rate' in content
         
         # Check metadata file has initial structure
-        import json
         with open(dm.metadata_file, 'r') as f:
             metadata = json.load(f)
             assert 'created' in metadata
@@ -64,6 +61,82 @@ class TestRateDataManager:
             assert 'rate_trend' in metadata
             assert metadata['total_records'] == 0
     
+    def test_get_rate_statistics_no_data(self, data_manager):
+        """Test getting statistics when no data exists"""
+        stats = data_manager.get_rate_statistics(days=30)
+        
+        assert 'error' in stats
+        assert stats['error'] == 'No data available'
+    
+    def test_calculate_volatility(self, data_manager):
+        """Test volatility calculation"""
+        # Test with stable rates
+        stable_rates = [5.25, 5.26, 5.24, 5.25]
+        volatility = data_manager._calculate_volatility(stable_rates)
+        assert isinstance(volatility, float)
+        assert volatility >= 0
+        
+        # Test with volatile rates
+        volatile_rates = [5.0, 6.0, 4.0, 7.0]
+        volatility = data_manager._calculate_volatility(volatile_rates)
+        assert volatility > 0
+        
+        # Test with single rate
+        single_rate = [5.25]
+        volatility = data_manager._calculate_volatility(single_rate)
+        assert volatility == 0.0
+
+
+@pytest.fixture(scope="module")
+def populated_dm(tmp_path_factory, bulk_save):
+    """Create a RateDataManager holding TEST_RATES, shared by TestRateDataManagerPopulated"""
+    dm = RateDataManager(str(tmp_path_factory.mktemp("populated_dm")))
+    bulk_save(dm, TestRateDataManagerPopulated.TEST_RATES)
+    return dm
+
+
+class TestRateDataManagerPopulated:
+    """Test cases that read one RateDataManager prepopulated with TEST_RATES"""
+    
+    TEST_RATES = [5.25, 5.30, 5.20, 5.35, 5.15]
+    
+    def test_get_recent_rates(self, populated_dm):
+        """Test getting recent rates"""
+        recent_rates = populated_dm.get_recent_rates(days=30)
+        
+        assert len(recent_rates) == 5
+        assert recent_rates == list(reversed(self.TEST_RATES))  # Should be ordered newest first
+    
+    def test_get_rate_statistics(self, populated_dm):
+        """Test getting rate statistics"""
+        test_rates = self.TEST_RATES
+        stats = populated_dm.get_rate_statistics(days=30)
+        
+        assert stats['period_days'] == 30
+        assert stats['record_count'] == 5
+        assert stats['latest_rate'] == 5.15  # Most recent
+        # approx, so the mean can be computed with fmean/numpy without test churn
+        assert stats['average_rate'] == pytest.approx(sum(test_rates) / len(test_rates), rel=1e-9)
+        assert stats['min_rate'] == min(test_rates)
+        assert stats['max_rate'] == max(test_rates)
+        assert 'trend' in stats
+        assert 'volatility' in stats
+        assert isinstance(stats['volatility'], float)
+    
+    def test_calculate_trend(self, populated_dm):
+        """Test trend calculation"""
+        # Newer half (5.15, 5.35) and older half (5.20, 5.30, 5.25) both average 5.25
+        assert populated_dm._calculate_trend() == 'stable'
+
+
+class TestRateDataManagerMutating:
+    """Test cases that write to the RateDataManager, each with its own directory"""
+    
+    @pytest.fixture
+    def data_manager(self, tmp_path):
+        """Create a RateDataManager instance with temp directory"""
+        return RateDataManager(str(tmp_path))
+    
     def test_save_rate(self, data_manager):
         """Test saving a rate record"""
         success = data_manager.save_rate(
@@ -116,96 +189,118 @@ class TestRateDataManager:
         assert metadata['latest_rate'] == 5.20  # Last rate saved
         assert len(metadata['sources_used']) == 3
     
-    def test_get_recent_rates(self, data_manager):
-        """Test getting recent rates"""
-        # Save some test rates
-        test_rates = [5.25, 5.30, 5.20, 5.35, 5.15]
-        for i, rate in enumerate(test_rates):
-            data_manager.save_rate(
-                rate=rate,
-                source=f"test{i}",
-                target_rate=6.0,
-                state="Oregon",
-                alert_sent=False,
-                daily_report_sent=False,
-                notes=f"Test rate {i}"
-            )
+    @pytest.mark.parametrize("old_rows,mmap_scan", [(2, False), (2000, True)], ids=["csv", "mmap"])
+    def test_get_recent_rates_cutoff(self, data_manager, old_rows, mmap_scan):
+        """Test that rows before the cutoff day are dropped across month and year boundaries"""
+        module = sys.modules[RateDataManager.__module__]
+        today = date.today()
+        cutoff = date(today.year - 1, 12, 15)
+        days = (today - cutoff).days
         
-        # Get recent rates
-        recent_rates = data_manager.get_recent_rates(days=30)
+        old = [(date(today.year - 1, 11, 30), 9.0), (cutoff - timedelta(days=1), 9.1)]
+        recent = [(cutoff, 5.1), (date(today.year, 1, 1), 5.2), (today, 5.3)]
+        with open(data_manager.rates_file, 'a', newline='') as f:
+            writer = csv.writer(f)
+            for day, rate in [old[i % 2] for i in range(old_rows)] + recent:
+                writer.writerow([day.isoformat(), f"{day.isoformat()}T12:00:00", rate, "fred",
+                                 6.0, "Oregon", False, False, ""])
+        assert (data_manager.rates_file.stat().st_size > module.MMAP_SCAN_THRESHOLD) == mmap_scan
         
-        assert len(recent_rates) == 5
-        assert recent_rates == sorted(test_rates, reverse=True)  # Should be sorted newest first
+        with patch.object(data_manager, '_scan_recent_rates', wraps=data_manager._scan_recent_rates) as scan:
+            assert data_manager.get_recent_rates(days=days) == [5.3, 5.2, 5.1]
+        assert scan.called == mmap_scan
     
-    def test_get_rate_statistics(self, data_manager):
-        """Test getting rate statistics"""
-        # Save some test rates
-        test_rates = [5.25, 5.30, 5.20, 5.35, 5.15]
-        for i, rate in enumerate(test_rates):
-            data_manager.save_rate(
-                rate=rate,
-                source=f"test{i}",
-                target_rate=6.0,
-                state="Oregon",
-                alert_sent=False,
-                daily_report_sent=False,
-                notes=f"Test rate {i}"
-            )
-        
-        stats = data_manager.get_rate_statistics(days=30)
+    @pytest.mark.parametrize("rates,expected", [
+        ([5.0, 5.0, 5.5, 5.5], 'rising'),
+        ([5.5, 5.5, 5.0, 5.0], 'falling'),
+        ([5.25], 'insufficient_data'),
+    ])
+    def test_calculate_trend_direction(self, data_manager, bulk_save, rates, expected):
+        """Test that the trend compares the newer rates against the older ones (saved oldest first)"""
+        bulk_save(data_manager, rates)
         
-        assert stats['period_days'] == 30
-        assert stats['record_count'] == 5
-        assert stats['latest_rate'] == 5.15  # Most recent
-        assert stats['average_rate'] == sum(test_rates) / len(test_rates)
-        assert stats['min_rate'] == min(test_rates)
-        assert stats['max_rate'] == max(test_rates)
-        assert 'trend' in stats
-        assert 'volatility' in stats
-        assert isinstance(stats['volatility'], float)
+        assert data_manager._calculate_trend() == expected
     
-    def test_get_rate_statistics_no_data(self, data_manager):
-        """Test getting statistics when no data exists"""
-        stats = data_manager.get_rate_statistics(days=30)
+    def test_rebuild_metadata_repairs_total_records(self, data_manager):
+        """Test that rebuild_metadata recounts a drifted total_records from the CSV"""
+        for rate in [5.25, 5.30, 5.20]:
+            data_manager.save_rate(rate=rate, source="fred", target_rate=6.0, state="Oregon")
         
-        assert 'error' in stats
-        assert stats['error'] == 'No data available'
+        metadata = json.loads(data_manager.metadata_file.read_text())
+        metadata['total_records'] = 42
+        data_manager.metadata_file.write_text(json.dumps(metadata))
+        assert data_manager.get_metadata()['total_records'] == 42
+        
+        rebuilt = data_manager.rebuild_metadata()
+        
+        assert rebuilt['total_records'] == 3
+        assert data_manager.get_metadata()['total_records'] == 3
+        # Fields the rebuild does not derive are kept
+        assert data_manager.get_metadata()['latest_rate'] == 5.20
     
-    def test_calculate_trend(self, data_manager):
-        """Test trend calculation"""
-        # Save rates with a clear trend (decreasing)
-        decreasing_rates = [6.0, 5.8, 5.6, 5.4, 5.2]
-        for i, rate in enumerate(decreasing_rates):
-            data_manager.save_rate(
-                rate=rate,
-                source=f"test{i}",
-                target_rate=6.0,
-                state="Oregon",
-                alert_sent=False,
-                daily_report_sent=False,
-                notes=f"Test rate {i}"
-            )
+    def test_batch_defers_metadata(self, data_manager):
+        """Test that saves inside batch() update the metadata once on exit"""
+        with patch.object(data_manager, '_update_metadata', wraps=data_manager._update_metadata) as update:
+            with data_manager.batch():
+                for rate, source in [(5.25, "fred"), (5.30, "bankrate"), (5.20, "mnd")]:
+                    assert data_manager.save_rate(rate=rate, source=source, target_rate=6.0, state="Oregon")
+                update.assert_not_called()
+            update.assert_called_once()
         
-        trend = data_manager._calculate_trend()
-        assert trend in ['rising', 'falling', 'stable', 'insufficient_data']
+        assert data_manager._count_records() == 3
+        metadata = data_manager.get_metadata()
+        assert metadata['total_records'] == 3
+        assert metadata['latest_rate'] == 5.20
+        assert len(metadata['sources_used']) == 3
     
-    def test_calculate_volatility(self, data_manager):
-        """Test volatility calculation"""
-        # Test with stable rates
-        stable_rates = [5.25, 5.26, 5.24, 5.25]
-        volatility = data_manager._calculate_volatility(stable_rates)
-        assert isinstance(volatility, float)
-        assert volatility >= 0
+    def test_batch_metadata_trend_sees_flushed_rows(self, data_manager):
+        """Test that a trend cached inside batch() is not reused for the metadata"""
+        with data_manager.batch():
+            for rate in [6.0, 5.8, 5.2, 5.0]:
+                data_manager.save_rate(rate=rate, source="fred", target_rate=6.0, state="Oregon")
+            # Rows are still buffered, so this sees no data
+            assert data_manager._calculate_trend() == 'insufficient_data'
         
-        # Test with volatile rates
-        volatile_rates = [5.0, 6.0, 4.0, 7.0]
-        volatility = data_manager._calculate_volatility(volatile_rates)
-        assert volatility > 0
+        assert data_manager.get_metadata()['rate_trend'] == data_manager._compute_trend() != 'insufficient_data'
+    
+    def test_trend_cache_sees_other_instances(self, data_manager, tmp_path):
+        """Test that a write through another RateDataManager invalidates the cached trend"""
+        with patch.object(data_manager, '_compute_trend', return_value='stable') as compute:
+            data_manager._calculate_trend()
+            data_manager._calculate_trend()
+            assert compute.call_count == 1
+            
+            RateDataManager(str(tmp_path)).save_rate(rate=5.25, source="fred", target_rate=6.0, state="Oregon")
+            data_manager._calculate_trend()
+            assert compute.call_count == 2
+    
+    def test_trend_cache_expires_on_date_rollover(self, data_manager):
+        """Test that the cached trend is recomputed when the 7-day window moves"""
+        module = sys.modules[RateDataManager.__module__]
+        with patch.object(data_manager, '_compute_trend', return_value='stable') as compute, \
+             patch.object(module, 'date') as mock_date:
+            mock_date.today.return_value = date(2026, 1, 1)
+            data_manager._calculate_trend()
+            data_manager._calculate_trend()
+            assert compute.call_count == 1
+            
+            mock_date.today.return_value = date(2026, 1, 2)
+            data_manager._calculate_trend()
+            assert compute.call_count == 2
+    
+    def test_get_recent_rates_byte_scan(self, data_manager):
+        """Test that the mmap scan used for large files matches the csv reader"""
+        test_rates = [5.25, 5.30, 5.20, 5.35, 5.15]
+        data_manager.save_rates([
+            {'rate': rate, 'source': 'fred,bankrate', 'target_rate': 6.0, 'state': 'Oregon',
+             'notes': 'Sources: fred, bankrate, Confidence: high'}
+            for rate in test_rates
+        ])
+        expected = data_manager.get_recent_rates(days=30)
         
-        # Test with single rate
-        single_rate = [5.25]
-        volatility = data_manager._calculate_volatility(single_rate)
-        assert volatility == 0.0
+        module = sys.modules[RateDataManager.__module__]
+        with patch.object(module, 'MMAP_SCAN_THRESHOLD', 0):
+            assert data_manager.get_recent_rates(days=30) == expected == list(reversed(test_rates))
     
     def test_get_data_summary(self, data_manager):
         """Test getting data summary"""
@@ -271,10 +366,10 @@ class TestRateDataManager:
         assert 'created' in metadata
         assert 'last_updated' in metadata
     
-    def test_error_handling(self, temp_dir):
+    def test_error_handling(self, tmp_path):
         """Test error handling in data manager"""
         # Create a data manager with invalid directory (should still work)
-        dm = RateDataManager(temp_dir)
+        dm = RateDataManager(str(tmp_path))
         
         # Test saving with invalid data
         success = dm.save_rate(
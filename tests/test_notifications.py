@@ -0,0 +1,115 @@
+"""
+Tests for the notification services
+"""
+
+import smtplib
+import pytest
+from unittest.mock import patch
+
+from mortgage_alert.notifications import telegram_service
+from mortgage_alert.notifications.email_service import EmailNotificationService
+
+
+class TestEmailNotificationService:
+    """Test cases for EmailNotificationService"""
+    
+    @pytest.fixture
+    def mock_smtp(self):
+        """Patch smtplib.SMTP; the yielded mock is the class, its return_value the connection"""
+        with patch('smtplib.SMTP') as smtp_class:
+            server = smtp_class.return_value
+            server.noop.return_value = (250, b'OK')
+            server.sendmail.return_value = {}
+            yield smtp_class
+    
+    @pytest.fixture
+    def service(self, mock_smtp):
+        """Email service for two recipients"""
+        service = EmailNotificationService({
+            'smtp_server': 'smtp.example.com',
+            'smtp_port': 587,
+            'sender_email': 'alerts@example.com',
+            'sender_password': 'secret',
+            'recipient_email': 'a@example.com, b@example.com',
+        })
+        yield service
+        service.close()
+    
+    def test_send_alert_envelope_per_recipient(self, service, mock_smtp):
+        """Test that each recipient gets its own envelope of one shared payload"""
+        assert service.send_alert(5.25, 6.0, "Oregon") == True
+        
+        calls = mock_smtp.return_value.sendmail.call_args_list
+        assert [call.args[1] for call in calls] == [['a@example.com'], ['b@example.com']]
+        assert all(call.args[0] == 'alerts@example.com' for call in calls)
+        assert calls[0].args[2] is calls[1].args[2]
+    
+    def test_send_alert_hides_other_recipients(self, service, mock_smtp):
+        """Test that no message lists any recipient's address"""
+        service.send_alert(5.25, 6.0, "Oregon")
+        
+        for call in mock_smtp.return_value.sendmail.call_args_list:
+            data = call.args[2]
+            assert b'a@example.com' not in data
+            assert b'b@example.com' not in data
+            assert b'To: undisclosed-recipients:;' in data
+    
+    def test_send_alert_renders_template(self, service, mock_smtp):
+        """Test that alert and report emails use their own template variant"""
+        server = mock_smtp.return_value
+        
+        service.send_alert(5.25, 6.0, "Oregon", notification_type="alert")
+        alert = server.sendmail.call_args.args[2].decode()
+        service.send_alert(6.25, 6.0, "Oregon", notification_type="daily_report")
+        report = server.sendmail.call_args.args[2].decode()
+        
+        assert 'What This Means' in alert and 'Rate Analysis' not in alert
+        assert 'Rate Analysis' in report and 'What This Means' not in report
+        assert 'Oregon' in alert
+    
+    def test_connection_reused_across_sends(self, service, mock_smtp):
+        """Test that one authenticated SMTP connection serves repeated sends"""
+        service.send_alert(5.25, 6.0, "Oregon")
+        service.send_alert(5.25, 6.0, "Oregon")
+        
+        mock_smtp.assert_called_once()
+        mock_smtp.return_value.login.assert_called_once()
+        assert mock_smtp.return_value.sendmail.call_count == 4
+    
+    @pytest.mark.parametrize("error", [
+        smtplib.SMTPRecipientsRefused({'a@example.com': (550, b'No such user')}),
+        smtplib.SMTPDataError(554, b'Rejected'),
+    ])
+    def test_one_failed_recipient_reported(self, service, mock_smtp, error):
+        """Test that a failure for one recipient still sends to the rest but fails the send"""
+        server = mock_smtp.return_value
+        server.sendmail.side_effect = [error, {}]
+        
+        assert service.send_alert(5.25, 6.0, "Oregon") == False
+        assert server.sendmail.call_args.args[1] == ['b@example.com']
+        server.quit.assert_not_called()
+    
+    def test_disconnect_fails_send_and_drops_connection(self, service, mock_smtp):
+        """Test that a lost connection fails the send and reconnects next time"""
+        mock_smtp.return_value.sendmail.side_effect = smtplib.SMTPServerDisconnected('Connection lost')
+        
+        assert service.send_alert(5.25, 6.0, "Oregon") == False
+        assert service._smtp is None
+
+
+class TestTelegramNotificationService:
+    """Test cases for TelegramNotificationService"""
+    
+    def test_session_retries_only_undelivered_sends(self):
+        """Test that sendMessage POSTs are never retried after a read error or 5xx"""
+        session = telegram_service._create_session()
+        retries = session.get_adapter("https://api.telegram.org").max_retries
+        
+        assert retries.read == 0
+        assert retries.other == 0
+        assert retries.connect > 0
+        assert list(retries.status_forcelist) == [429]
+        assert retries.respect_retry_after_header
+        assert not retries.is_retry("POST", 500)
+        assert not retries.is_retry("POST", 503)
+        assert retries.is_retry("POST", 429, has_retry_after=True)
@@ -2,197 +2,452 @@
 Tests for the Enhanced Rate Scraper
 """
 
+import copy
 import pytest
+import re
 import sys
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
-
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import threading
+import time
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
 
 from mortgage_alert.scrapers.rate_scraper import EnhancedRateScraper, get_enhanced_rate_scraper, get_mock_rate
+from mortgage_alert.scrapers.ttl_cache import AdaptiveTTLCache
 
 
 class TestEnhancedRateScraper:
     """Test cases for EnhancedRateScraper"""
     
-    def test_enhanced_rate_scraper_initialization(self):
+    @pytest.fixture(scope="module")
+    def scraper_proto(self):
+        """Build one EnhancedRateScraper for the module to copy from"""
+        return EnhancedRateScraper()
+    
+    @pytest.fixture
+    def scraper(self, scraper_proto):
+        """Shallow copy of the prototype with its own rate cache"""
+        scraper = copy.copy(scraper_proto)
+        scraper.rate_cache = AdaptiveTTLCache()
+        return scraper
+    
+    @pytest.fixture
+    def mock_session_get(self):
+        """Patch Session.get; tests set mock_session_get.return_value to a response"""
+        with patch('mortgage_alert.scrapers.rate_scraper.requests.Session.get') as mock_get:
+            yield mock_get
+    
+    @pytest.fixture(scope="module")
+    def fred_response_proto(self):
+        """Successful FRED API response, built once and copied per test"""
+        response = Mock()
+        response.json.return_value = {
+            'observations': [
+                {'value': '5.25'}
+            ]
+        }
+        response.raise_for_status.return_value = None
+        return response
+    
+    @pytest.fixture(scope="module")
+    def bankrate_response_proto(self):
+        """Successful Bankrate page response, built once and copied per test"""
+        response = Mock()
+        response.content = b'<html><body><div class="rate-value">5.25%</div></body></html>'
+        response.raise_for_status.return_value = None
+        return response
+    
+    def test_enhanced_rate_scraper_initialization(self, scraper):
         """Test that EnhancedRateScraper initializes correctly"""
-        scraper = EnhancedRateScraper()
         assert scraper is not None
         assert hasattr(scraper, 'rate_sources')
         assert isinstance(scraper.rate_sources, dict)
         assert len(scraper.rate_sources) > 0
     
-    def test_rate_validation(self):
+    def test_rate_sources_are_callable(self, scraper):
+        """Test that rate_sources maps each source to a callable fetching it"""
+        assert all(callable(fetch) for fetch in scraper.rate_sources.values())
+        with patch.object(scraper, '_get_fred_rate', return_value=5.25):
+            assert scraper.rate_sources['fred']() == 5.25
+    
+    @pytest.mark.parametrize("rate,expected", [
+        # Valid rates
+        (4.5, True), (5.25, True), (6.0, True), (7.5, True), (8.0, True),
+        # Invalid rates
+        (0, False), (1.5, False), (16.0, False), (25.0, False), (-1.0, False), (0.0, False),
+        # Edge cases
+        (2.0, True),  # Minimum valid
+        (15.0, True),  # Maximum valid
+        (1.99, False),  # Just below minimum
+        (15.01, False),  # Just above maximum
+    ])
+    def test_rate_validation(self, scraper, rate, expected):
         """Test rate validation functionality"""
-        scraper = EnhancedRateScraper()
-        
-        # Test valid rates
-        valid_rates = [4.5, 5.25, 6.0, 7.5, 8.0]
-        for rate in valid_rates:
-            assert scraper._validate_rate(rate) == True, f"Rate {rate} should be valid"
-        
-        # Test invalid rates
-        invalid_rates = [0, 1.5, 16.0, 25.0, -1.0, 0.0]
-        for rate in invalid_rates:
-            assert scraper._validate_rate(rate) == False, f"Rate {rate} should be invalid"
-        
-        # Test edge cases
-        assert scraper._validate_rate(2.0) == True  # Minimum valid
-        assert scraper._validate_rate(15.0) == True  # Maximum valid
-        assert scraper._validate_rate(1.99) == False  # Just below minimum
-        assert scraper._validate_rate(15.01) == False  # Just above maximum
+        assert scraper._validate_rate(rate) is expected
     
-    def test_rate_extraction_from_text(self):
+    @pytest.mark.parametrize("text,expected_rate", [
+        ("5.25%", 5.25),
+        ("5.25 percent", 5.25),
+        ("rate: 5.25", 5.25),
+        ("5.25 APR", 5.25),
+        ("5.25 interest", 5.25),
+        ("5.25 fixed", 5.25),
+        ("5.25 refinance", 5.25),
+        ("Current rate is 5.25%", 5.25),
+        ("The mortgage rate is 6.75% today", 6.75),
+    ])
+    def test_rate_extraction_from_text(self, scraper, text, expected_rate):
         """Test rate extraction from various text formats"""
-        scraper = EnhancedRateScraper()
-        
-        test_cases = [
-            ("5.25%", 5.25),
-            ("5.25 percent", 5.25),
-            ("rate: 5.25", 5.25),
-            ("5.25 APR", 5.25),
-            ("5.25 interest", 5.25),
-            ("5.25 fixed", 5.25),
-            ("5.25 refinance", 5.25),
-            ("Current rate is 5.25%", 5.25),
-            ("The mortgage rate is 6.75% today", 6.75),
-        ]
-        
-        for text, expected_rate in test_cases:
-            result = scraper._extract_rate_from_text(text)
-            assert result == expected_rate, f"Failed to extract {expected_rate} from '{text}'"
-    
-    def test_rate_extraction_invalid_text(self):
+        assert scraper._extract_rate_from_text(text) == expected_rate
+    
+    @pytest.mark.parametrize("text", [
+        "",
+        "No rate here",
+        "25.5%",  # Too high
+        "1.5%",   # Too low
+        "rate: 0%",  # Zero rate
+        "invalid text",
+        "5.25.5%",  # Invalid format
+    ])
+    def test_rate_extraction_invalid_text(self, scraper, text):
         """Test rate extraction with invalid text"""
-        scraper = EnhancedRateScraper()
-        
-        invalid_texts = [
-            "",
-            "No rate here",
-            "25.5%",  # Too high
-            "1.5%",   # Too low
-            "rate: 0%",  # Zero rate
-            "invalid text",
-            "5.25.5%",  # Invalid format
-        ]
-        
-        for text in invalid_texts:
-            result = scraper._extract_rate_from_text(text)
-            assert result is None, f"Should not extract rate from '{text}'"
-    
-    def test_confidence_calculation(self):
-        """Test confidence calculation"""
-        scraper = EnhancedRateScraper()
+        assert scraper._extract_rate_from_text(text) is None
+    
+    def test_extract_rate_regex_is_precompiled(self, scraper):
+        """Test that rate extraction uses module-level compiled patterns"""
+        module = sys.modules[EnhancedRateScraper.__module__]
+        assert isinstance(module._RATE_RE, re.Pattern)
         
-        # High confidence: multiple sources with low variance
-        rates_high = [5.25, 5.30, 5.20]
-        sources_high = ['fred', 'bankrate', 'mnd']
-        confidence = scraper._calculate_confidence(rates_high, sources_high)
-        assert confidence == 'high'
+        # Extraction must not compile anything per call
+        with patch.object(module.re, 'compile', side_effect=AssertionError("re.compile called")):
+            assert scraper._extract_rate_from_text("Current rate is 5.25%") == 5.25
+    
+    @pytest.mark.parametrize("html,expected_rate", [
+        (b'<div class="rate-value">5.25%</div>', 5.25),
+        (b'<p class="big current_rate" id="r"> 6.1 %</p>', 6.1),
+        (b'<span class="rate">7.0%</span>', 7.0),
+        # "rate" only as part of another word
+        (b'<span class="moderate">3.5%</span>', None),
+        (b'<div class="corporate x">3.5%</div>', None),
+        (b'<div class="accurate-info">3.5%</div>', None),
+        (b'<div class="a separate b">3.5%</div>', None),
+    ])
+    def test_fast_rate_matches_whole_class_tokens(self, scraper, html, expected_rate):
+        """Test that the raw-bytes fast path only matches rate class tokens"""
+        assert scraper._fast_rate_from_bytes(html) == expected_rate
+    
+    def test_fast_path_does_not_bypass_narrow_selectors(self, scraper):
+        """Test that sources with narrow selectors ignore other rate-classed elements"""
+        module = sys.modules[EnhancedRateScraper.__module__]
+        html = b'<div class="rate-disclaimer">3.5% APR example</div><div class="zillow-rate">6.25%</div>'
         
+        assert scraper._parse_rate_from_html(html, module._ZILLOW_SELECTOR, fallback=False) == 6.25
+        assert scraper._parse_rate_from_html(html, module._BANKRATE_SELECTOR, fast_path=True) == 3.5
+    
+    @pytest.mark.parametrize("rates,sources,expected", [
+        # High confidence: multiple sources with low variance
+        ([5.25, 5.30, 5.20], ['fred', 'bankrate', 'mnd'], 'high'),
         # Medium confidence: multiple sources with moderate variance
-        rates_medium = [5.25, 5.50]
-        sources_medium = ['fred', 'bankrate']
-        confidence = scraper._calculate_confidence(rates_medium, sources_medium)
-        assert confidence == 'medium'
-        
+        ([5.25, 5.50], ['fred', 'bankrate'], 'medium'),
         # Low confidence: few sources or high variance
-        rates_low = [5.25, 6.50]
-        sources_low = ['fred', 'bankrate']
-        confidence = scraper._calculate_confidence(rates_low, sources_low)
-        assert confidence == 'low'
-        
+        ([5.25, 6.50], ['fred', 'bankrate'], 'low'),
         # Single source should be low confidence
-        rates_single = [5.25]
-        sources_single = ['fred']
-        confidence = scraper._calculate_confidence(rates_single, sources_single)
-        assert confidence == 'low'
+        ([5.25], ['fred'], 'low'),
+    ])
+    def test_confidence_calculation(self, scraper, rates, sources, expected):
+        """Test confidence calculation"""
+        assert scraper._calculate_confidence(rates, sources) == expected
     
-    @patch('mortgage_alert.scrapers.rate_scraper.requests.Session.get')
-    def test_fred_rate_scraping(self, mock_get):
+    def test_fred_rate_scraping(self, scraper, mock_session_get, fred_response_proto, monkeypatch):
         """Test FRED rate scraping with mocked response"""
-        scraper = EnhancedRateScraper()
+        # Mock environment variable for API key
+        monkeypatch.setenv('FRED_API_KEY', 'test_key')
         
         # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            'observations': [
-                {'value': '5.25'}
-            ]
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_session_get.return_value = copy.copy(fred_response_proto)
         
-        # Mock environment variable for API key
-        with patch.dict('os.environ', {'FRED_API_KEY': 'test_key'}):
-            rate = scraper._get_fred_rate()
-            assert rate == 5.25
+        rate = scraper._get_fred_rate()
+        assert rate == 5.25
     
-    @patch('mortgage_alert.scrapers.rate_scraper.requests.Session.get')
-    def test_bankrate_scraping(self, mock_get):
-        """Test Bankrate scraping with mocked response"""
-        scraper = EnhancedRateScraper()
+    @pytest.mark.parametrize("csv_text", [
+        'observation_date,MORTGAGE30US\n2024-01-04,6.62\n2024-01-11,6.85\n',
+        '"observation_date","MORTGAGE30US"\n"2024-01-04","6.62"\n"2024-01-11","6.85"\n',
+        'observation_date,MORTGAGE30US\n2024-01-04,6.85\n2024-01-11,.\n',
+    ], ids=["plain", "quoted", "latest-missing"])
+    def test_fred_csv_scraping(self, scraper, mock_session_get, csv_text):
+        """Test the keyless FRED CSV path takes the latest observation, quoted or not"""
+        scraper.fred_api_key = ''
+        scraper.min_request_interval = 0
+        mock_session_get.return_value = Mock(text=csv_text)
         
+        assert scraper._get_fred_rate() == 6.85
+    
+    def test_bankrate_scraping(self, scraper, mock_session_get, bankrate_response_proto):
+        """Test Bankrate scraping with mocked response"""
         # Mock successful response with HTML content
-        mock_response = Mock()
-        mock_response.content = b'<html><body><div class="rate-value">5.25%</div></body></html>'
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_session_get.return_value = copy.copy(bankrate_response_proto)
         
         rate = scraper._get_bankrate_rate()
         assert rate == 5.25
+        # The first page had a rate, so no other Bankrate page is requested
+        assert mock_session_get.call_count == 1
+    
+    def test_bankrate_stops_at_first_rate(self, scraper):
+        """Test that Bankrate pages are fetched in order until one yields a rate"""
+        with patch.object(scraper, '_fetch_and_parse', side_effect=[None, 5.30, 5.40, 5.50]) as fetch:
+            assert scraper._get_bankrate_rate() == 5.30
+            assert fetch.call_count == 2
+    
+    @pytest.fixture
+    def all_sources_work(self):
+        """Source method return values when every source has a rate"""
+        return {'_get_fred_rate': 5.25, '_get_bankrate_rate': 5.30, '_get_mnd_rate': 5.20}
+    
+    @pytest.fixture
+    def no_sources_work(self):
+        """Source method return values when no source has a rate"""
+        return {'_get_fred_rate': None, '_get_bankrate_rate': None, '_get_mnd_rate': None}
+    
+    @pytest.fixture
+    def mixed_sources(self):
+        """Source method return values when only some sources have a rate"""
+        return {'_get_fred_rate': 5.25, '_get_bankrate_rate': None, '_get_mnd_rate': 5.30}
     
-    def test_get_aggregated_rate_mock(self):
+    @pytest.mark.parametrize("scenario_fixture,expected_rate,expected_sources", [
+        ("all_sources_work", 5.25, ['fred', 'bankrate', 'mortgage_news_daily']),  # Median
+        ("no_sources_work", None, []),
+        ("mixed_sources", 5.275, ['fred', 'mortgage_news_daily']),  # Average of 5.25 and 5.30
+    ])
+    def test_get_aggregated_rate(self, scraper, request, scenario_fixture, expected_rate, expected_sources):
         """Test aggregated rate calculation with mocked sources"""
-        scraper = EnhancedRateScraper()
-        
-        # Mock individual source methods
-        with patch.object(scraper, '_get_fred_rate', return_value=5.25), \
-             patch.object(scraper, '_get_bankrate_rate', return_value=5.30), \
-             patch.object(scraper, '_get_mnd_rate', return_value=5.20):
+        # Only the selected scenario's fixture is built
+        scenario = request.getfixturevalue(scenario_fixture)
+        with ExitStack() as stack:
+            for method, value in scenario.items():
+                stack.enter_context(patch.object(scraper, method, return_value=value))
             
             rate, source_data = scraper.get_aggregated_rate(['fred', 'bankrate', 'mortgage_news_daily'])
-            
-            assert rate is not None
-            assert 5.20 <= rate <= 5.30  # Should be median (5.25)
+        
+        if expected_rate is None:
+            assert rate is None
+            assert source_data['error'] == 'No valid rates found'
+        else:
+            assert rate == pytest.approx(expected_rate, abs=1e-6)
             assert 'aggregated_rate' in source_data
             assert 'source_rates' in source_data
-            assert 'successful_sources' in source_data
             assert 'confidence' in source_data
-            assert len(source_data['successful_sources']) == 3
+            assert source_data['successful_sources'] == expected_sources
     
-    def test_get_aggregated_rate_no_sources(self):
-        """Test aggregated rate when no sources work"""
-        scraper = EnhancedRateScraper()
-        
-        # Mock all sources to return None
-        with patch.object(scraper, '_get_fred_rate', return_value=None), \
-             patch.object(scraper, '_get_bankrate_rate', return_value=None):
+    def test_get_aggregated_rate_cached(self, scraper):
+        """Test that source rates are reused from the in-memory cache until refresh is requested"""
+        with patch.object(scraper, '_get_fred_rate', return_value=5.25) as fred:
+            first = scraper.get_aggregated_rate(['fred'])
+            assert scraper.get_aggregated_rate(['fred']) == first
+            assert fred.call_count == 1
             
+            scraper.get_aggregated_rate(['fred'], refresh=True)
+            assert fred.call_count == 2
+    
+    def test_check_cycle_fetches_each_url_once(self, scraper, mock_session_get, bankrate_response_proto):
+        """Test that repeated lookups in one check cycle never refetch a page"""
+        mock_session_get.return_value = copy.copy(bankrate_response_proto)
+        scraper.min_request_interval = 0
+        sources = ['bankrate', 'mortgage_news_daily', 'freddiemac']
+        
+        first = scraper.get_aggregated_rate(sources)
+        assert scraper.get_aggregated_rate(sources) == first
+        
+        assert first[1]['successful_sources'] == sources
+        urls = [call.args[0] for call in mock_session_get.call_args_list]
+        assert len(urls) == len(sources)
+        assert len(set(urls)) == len(urls)
+    
+    def test_early_exit_skips_slow_source(self, scraper):
+        """Test that agreeing sources settle the result without waiting for a slow one"""
+        release = threading.Event()
+        
+        def slow_freddiemac():
+            release.wait(5)
+            return 5.40
+        
+        try:
+            with patch.object(scraper, '_get_fred_rate', return_value=5.25), \
+                 patch.object(scraper, '_get_bankrate_rate', return_value=5.26), \
+                 patch.object(scraper, '_get_mnd_rate', return_value=5.24), \
+                 patch.object(scraper, '_get_freddiemac_rate', side_effect=slow_freddiemac):
+                start = time.monotonic()
+                rate, source_data = scraper.get_aggregated_rate(
+                    ['fred', 'bankrate', 'mortgage_news_daily', 'freddiemac'])
+                elapsed = time.monotonic() - start
+        finally:
+            release.set()
+        
+        assert elapsed < 2
+        assert rate == 5.25
+        assert source_data['successful_sources'] == ['fred', 'bankrate', 'mortgage_news_daily']
+        assert 'freddiemac' not in source_data['source_rates']
+        assert source_data['confidence'] == 'high'
+    
+    def test_slow_source_requests_bounded_by_deadline(self, scraper, mock_session_get):
+        """Test that a source still running after SOURCE_TIMEOUT makes no late requests"""
+        module = sys.modules[EnhancedRateScraper.__module__]
+        finished = threading.Event()
+        
+        def slow_fred():
+            time.sleep(0.3)
+            try:
+                return scraper._make_request("https://fred.example.com/slow")
+            finally:
+                finished.set()
+        
+        with patch.object(module, 'SOURCE_TIMEOUT', 0.1), \
+             patch.object(scraper, '_get_fred_rate', side_effect=slow_fred), \
+             patch.object(scraper, '_get_bankrate_rate', return_value=5.30):
             rate, source_data = scraper.get_aggregated_rate(['fred', 'bankrate'])
             
-            assert rate is None
-            assert 'error' in source_data
-            assert source_data['error'] == 'No valid rates found'
+            assert rate == 5.30
+            assert source_data['source_rates']['fred'] is None
+            # The abandoned worker finishes without starting its request
+            assert finished.wait(2)
+        mock_session_get.assert_not_called()
     
-    def test_get_aggregated_rate_mixed_results(self):
-        """Test aggregated rate with some sources working"""
-        scraper = EnhancedRateScraper()
+    def test_request_timeout_capped_by_deadline(self, scraper, mock_session_get):
+        """Test that requests made for a source use the time left as their timeout"""
+        module = sys.modules[EnhancedRateScraper.__module__]
+        mock_session_get.return_value = Mock(content=b'')
         
-        # Mock mixed results
-        with patch.object(scraper, '_get_fred_rate', return_value=5.25), \
-             patch.object(scraper, '_get_bankrate_rate', return_value=None), \
-             patch.object(scraper, '_get_mnd_rate', return_value=5.30):
+        with patch.object(module, 'SOURCE_TIMEOUT', 5), \
+             patch.object(scraper, '_get_fred_rate',
+                          side_effect=lambda: scraper._make_request("https://fred.example.com/") and None):
+            scraper.get_aggregated_rate(['fred'])
+        
+        timeout = mock_session_get.call_args.kwargs['timeout']
+        assert 0 < timeout <= 5
+        
+        # Outside an aggregation round the regular timeout applies
+        scraper._make_request("https://other.example.com/")
+        assert mock_session_get.call_args.kwargs['timeout'] == module.REQUEST_TIMEOUT
+
+
+class TestDeadlineRetries:
+    """Test cases for adapter retries inside an aggregation round"""
+    
+    @pytest.fixture
+    def unavailable_server(self):
+        """Local server answering every GET with 503; yields (url, paths hit, Retry-After setter)"""
+        hits = []
+        retry_after = ['30']
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                hits.append(self.path)
+                self.send_response(503)
+                self.send_header('Retry-After', retry_after[0])
+                self.send_header('Content-Length', '0')
+                self.end_headers()
             
-            rate, source_data = scraper.get_aggregated_rate(['fred', 'bankrate', 'mortgage_news_daily'])
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}/", hits, lambda value: retry_after.__setitem__(0, value)
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    @pytest.fixture
+    def scraper(self):
+        """Scraper without politeness delay, so only retries space the requests"""
+        return EnhancedRateScraper(min_request_interval=0)
+    
+    @pytest.fixture(autouse=True)
+    def sleep(self):
+        """Record urllib3's retry sleeps instead of waiting them out"""
+        with patch('urllib3.util.retry.time.sleep') as sleep:
+            yield sleep
+    
+    def fetch_in_round(self, scraper, url, time_left):
+        """Request url as a source whose round deadline is time_left seconds away"""
+        with patch.object(scraper, '_get_fred_rate', side_effect=lambda: scraper._make_request(url)):
+            return scraper._run_source('fred', time.monotonic() + time_left)
+    
+    def test_retry_after_past_deadline_not_waited_for(self, scraper, unavailable_server, sleep):
+        """Test that a Retry-After longer than the time left ends the source's requests"""
+        url, hits, _ = unavailable_server
+        
+        assert self.fetch_in_round(scraper, url, 2) is None
+        
+        assert hits == ['/']
+        sleep.assert_not_called()
+    
+    def test_retries_that_fit_still_made(self, scraper, unavailable_server, sleep):
+        """Test that retries whose backoff fits before the deadline still happen"""
+        url, hits, set_retry_after = unavailable_server
+        set_retry_after('0')
+        
+        self.fetch_in_round(scraper, url, 45)
+        
+        module = sys.modules[EnhancedRateScraper.__module__]
+        assert len(hits) == module.REQUEST_RETRIES + 1
+        # Exponential backoff between attempts, the first retry immediate
+        assert [call.args[0] for call in sleep.call_args_list] == [2, 4]
+    
+    def test_backoff_past_deadline_not_waited_for(self, scraper, unavailable_server, sleep):
+        """Test that retrying stops once the next backoff plus attempt would overrun"""
+        url, hits, set_retry_after = unavailable_server
+        set_retry_after('0')
+        
+        # 30s attempts: the immediate retry fits in 31s, the 2s backoff does not
+        self.fetch_in_round(scraper, url, 31)
+        
+        assert len(hits) == 2
+        sleep.assert_not_called()
+
+
+class TestThrottle:
+    """Test cases for the per-host request spacing in _throttle"""
+    
+    @pytest.fixture
+    def module(self):
+        """The rate_scraper module, with no hosts requested yet"""
+        module = sys.modules[EnhancedRateScraper.__module__]
+        with patch.dict(module._last_request_at, clear=True):
+            yield module
+    
+    def test_same_host_requests_spaced(self, module):
+        """Test that back-to-back requests to one host sleep out the interval"""
+        with patch.object(module.time, 'monotonic', return_value=100.0), \
+             patch.object(module.time, 'sleep') as sleep:
+            module._throttle("https://www.bankrate.com/a", 0.5)
+            sleep.assert_not_called()
             
-            assert rate is not None
-            assert rate == 5.275  # Average of 5.25 and 5.30
-            assert len(source_data['successful_sources']) == 2
-            assert 'fred' in source_data['successful_sources']
-            assert 'mortgage_news_daily' in source_data['successful_sources']
+            module._throttle("https://www.bankrate.com/b", 0.5)
+            sleep.assert_called_once_with(pytest.approx(0.5))
+            
+            # A third request queues behind the second
+            module._throttle("https://www.bankrate.com/c", 0.5)
+            assert sleep.call_args.args[0] == pytest.approx(1.0)
+    
+    def test_different_hosts_not_spaced(self, module):
+        """Test that requests to different hosts do not wait for each other"""
+        with patch.object(module.time, 'monotonic', return_value=100.0), \
+             patch.object(module.time, 'sleep') as sleep:
+            module._throttle("https://www.bankrate.com/", 0.5)
+            module._throttle("https://www.freddiemac.com/pmms", 0.5)
+            module._throttle("https://fred.stlouisfed.org/", 0.5)
+        
+        sleep.assert_not_called()
+    
+    def test_interval_already_elapsed(self, module):
+        """Test that no sleep happens once min_interval has passed"""
+        with patch.object(module.time, 'monotonic', side_effect=[100.0, 100.6]), \
+             patch.object(module.time, 'sleep') as sleep:
+            module._throttle("https://www.bankrate.com/", 0.5)
+            module._throttle("https://www.bankrate.com/", 0.5)
+        
+        sleep.assert_not_called()
 
 
 class TestRateScraperFactory:
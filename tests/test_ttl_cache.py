@@ -0,0 +1,106 @@
+"""
+Tests for the adaptive TTL rate cache
+"""
+
+import pytest
+from unittest.mock import patch
+
+from mortgage_alert.scrapers.ttl_cache import AdaptiveTTLCache
+from mortgage_alert.scrapers.rate_scraper import EnhancedRateScraper
+
+
+class TestAdaptiveTTLCache:
+    """Test cases for AdaptiveTTLCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache with a 1 minute to 1 hour TTL range and no early refresh"""
+        return AdaptiveTTLCache(tmp_path / "rate_cache.json", min_ttl=60, max_ttl=3600, early_refresh=1.0)
+
+    def test_missing_entry(self, cache):
+        """Test that unknown sources are not cached"""
+        assert cache.get("fred", now=0) is None
+
+    def test_new_rate_uses_min_ttl(self, cache):
+        """Test that a rate that just changed is only trusted for min_ttl"""
+        cache.put("fred", 6.5, now=1000)
+        assert cache.get("fred", now=1059) == 6.5
+        assert cache.get("fred", now=1060) is None
+
+    def test_ttl_grows_while_rate_is_stable(self, cache):
+        """Test that the TTL is alpha times how long the rate has been unchanged"""
+        cache.put("fred", 6.5, now=0)
+        cache.put("fred", 6.5, now=2000)
+        assert cache.get("fred", now=2999) == 6.5
+        assert cache.get("fred", now=3000) is None
+
+    def test_changed_rate_resets_ttl(self, cache):
+        """Test that a new value resets the stable age"""
+        cache.put("fred", 6.5, now=0)
+        cache.put("fred", 6.4, now=2000)
+        assert cache.get("fred", now=2060) is None
+
+    def test_ttl_capped_at_max(self, cache):
+        """Test that long-stable rates are still refetched after max_ttl"""
+        cache.put("fred", 6.5, now=0)
+        cache.put("fred", 6.5, now=100000)
+        assert cache.get("fred", now=100000 + 3600) is None
+
+    def test_per_source_max_ttl(self, cache):
+        """Test that a per-source cap overrides the cache-wide maximum"""
+        cache.put("bankrate", 6.5, now=0)
+        cache.put("bankrate", 6.5, now=100000, max_ttl=600)
+        assert cache.get("bankrate", now=100599) == 6.5
+        assert cache.get("bankrate", now=100600) is None
+
+    @pytest.mark.parametrize("age,draw,fresh", [
+        (47, 0.0, True),    # Before 80% of the TTL: always fresh
+        (54, 0.49, False),  # Halfway to the TTL: refreshed half the time
+        (54, 0.5, True),
+        (59, 0.9, False),   # Just before the TTL: almost always refreshed
+    ])
+    def test_early_refresh(self, tmp_path, age, draw, fresh):
+        """Test that entries near their TTL are refreshed early with rising probability"""
+        cache = AdaptiveTTLCache(tmp_path / "rate_cache.json", min_ttl=60, max_ttl=3600)
+        cache.put("fred", 6.5, now=0)
+        
+        with patch('random.random', return_value=draw):
+            assert (cache.get("fred", now=age) == 6.5) is fresh
+
+    def test_persistence(self, cache, tmp_path):
+        """Test that entries survive a reload from disk"""
+        cache.put("fred", 6.5, now=0)
+        cache.save()
+
+        reloaded = AdaptiveTTLCache(tmp_path / "rate_cache.json", min_ttl=60, max_ttl=3600)
+        assert reloaded.get("fred", now=30) == 6.5
+
+    def test_in_memory_cache(self, tmp_path, monkeypatch):
+        """Test that a cache without a path works but never writes a file"""
+        monkeypatch.chdir(tmp_path)
+        cache = AdaptiveTTLCache(min_ttl=60)
+        cache.put("fred", 6.5, now=0)
+        cache.save()
+        assert cache.get("fred", now=30) == 6.5
+        assert list(tmp_path.iterdir()) == []
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        """Test that an unreadable cache file is ignored"""
+        path = tmp_path / "rate_cache.json"
+        path.write_text("not json")
+        assert AdaptiveTTLCache(path).get("fred") is None
+
+    def test_aggregated_rate_uses_cache(self, cache):
+        """Test that fresh cached sources are not fetched, unless refreshing"""
+        cache.put("fred", 6.5)
+        scraper = EnhancedRateScraper(rate_cache=cache)
+
+        with patch.object(scraper, '_get_fred_rate', return_value=6.7) as fetch:
+            rate, source_data = scraper.get_aggregated_rate(['fred'])
+            assert rate == 6.5
+            assert source_data['successful_sources'] == ['fred']
+            fetch.assert_not_called()
+
+            rate, _ = scraper.get_aggregated_rate(['fred'], refresh=True)
+            assert rate == 6.7
+            fetch.assert_called_once()